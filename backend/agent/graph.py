@@ -2,6 +2,13 @@
 LangGraph workflow for chat processing with memory integration.
 """
 
+import asyncio
+import logging
+import queue
+import re
+import threading
+import time
+from functools import lru_cache
 from typing import Annotated, AsyncIterator
 from typing_extensions import TypedDict
 
@@ -11,10 +18,52 @@ from langgraph.graph.message import add_messages
 
 from agent.llm_provider import get_llm
 from agent.prompts import SYSTEM_PROMPT, MEMORY_EXTRACTION_PROMPT
+from agent.response_cache import get_response_cache
+from agent.tools import get_tool_context
+from config import DEFAULT_MODEL
 from memory.checkpointer import get_checkpointer
-from memory.manager import MemoryManager, extract_facts_from_response
+from memory.manager import extract_facts_from_response, get_memory_manager
 from utils.context_manager import manage_context
 
+logger = logging.getLogger(__name__)
+
+
+# Static instruction block appended to the system prompt whenever tool
+# results are present. Defined once at module scope so hot paths don't
+# re-allocate the literal on every call.
+TOOL_INSTRUCTIONS = """
+
+=== CRITICAL: TOOL RESULTS PROVIDED - YOU MUST USE THEM ===
+
+You have been given REAL-TIME search results and/or document content below.
+Your response MUST follow these rules:
+
+1. **USE THE DATA**: Extract specific facts, dates, names, and details from the results.
+2. **CITE SOURCES**: When stating facts from search results, include the source URL.
+   Format: "According to [Source Name](URL), ..."
+3. **BE SPECIFIC**: Include exact dates, times, locations, and details found in the results.
+4. **NO GENERIC RESPONSES**: Do NOT say things like "check the official website" or
+   "I don't have current information" - THE RESULTS BELOW ARE CURRENT.
+5. **ACKNOWLEDGE LIMITATIONS**: If the results don't contain the answer, say exactly what
+   information IS available and what is missing.
+
+FORBIDDEN RESPONSES:
+- "I recommend checking [website] for the latest information"
+- "I don't have access to real-time data"
+- "As of my knowledge cutoff..."
+- Generic advice without specific facts from the results
+
+REQUIRED FORMAT:
+- Lead with the direct answer using facts from the results
+- Cite at least one source URL
+- Add relevant context from other results if available
+
+"""
+
+# Pre-rendered system prompt for the common no-memory case, so cold
+# conversations skip the format-string parse entirely
+_SYSTEM_PROMPT_EMPTY = SYSTEM_PROMPT.format(memory_context="")
+
 
 # ============================================================================
 # State Definition
@@ -43,17 +92,18 @@ class ChatState(TypedDict):
 def load_memory(state: ChatState) -> dict:
     """Load relevant memories for the current conversation."""
     user_id = state["user_id"]
-    messages = state["messages"]
-    
-    # Get the latest user message for memory search
-    last_user_msg = ""
-    for msg in reversed(messages):
-        if isinstance(msg, HumanMessage):
-            last_user_msg = msg.content
-            break
-    
+
+    # Callers seed last_user_message in the initial state; fall back to
+    # scanning the history only if an older entry point left it empty
+    last_user_msg = state.get("last_user_message", "")
+    if not last_user_msg:
+        for msg in reversed(state["messages"]):
+            if isinstance(msg, HumanMessage):
+                last_user_msg = msg.content
+                break
+
     # Search for relevant memories
-    memory_manager = MemoryManager(user_id)
+    memory_manager = get_memory_manager(user_id)
     memory_context = memory_manager.get_context_memories(
         query=last_user_msg,
         limit=10
@@ -67,8 +117,6 @@ def load_memory(state: ChatState) -> dict:
 
 def load_tool_context(state: ChatState) -> dict:
     """Load tool context (search and/or RAG) for the query."""
-    from agent.tools import get_tool_context
-    
     last_user_msg = state.get("last_user_message", "")
     conversation_id = state.get("conversation_id", "")
     tool_mode = state.get("tool_mode", "auto")
@@ -76,7 +124,12 @@ def load_tool_context(state: ChatState) -> dict:
     
     if not last_user_msg:
         return {"tool_context": "", "tool_metadata": {}}
-    
+
+    # Tools fully disabled: skip get_tool_context entirely rather than
+    # letting it classify intent just to decide to do nothing
+    if tool_mode == "none" and not use_rag:
+        return {"tool_context": "", "tool_metadata": {}}
+
     tool_context, tool_metadata = get_tool_context(
         query=last_user_msg,
         conversation_id=conversation_id,
@@ -90,49 +143,71 @@ def load_tool_context(state: ChatState) -> dict:
     }
 
 
-def generate_response(state: ChatState) -> dict:
-    """Generate a response using the LLM."""
-    model_name = state["model_name"]
-    memory_context = state.get("memory_context", "")
-    tool_context = state.get("tool_context", "")
-    tool_metadata = state.get("tool_metadata", {})
-    
-    # Build system message with memory and tool context
-    system_content = SYSTEM_PROMPT.format(
-        memory_context=memory_context if memory_context else ""
+@lru_cache(maxsize=256)
+def _render_system_prompt(memory_context: str) -> str:
+    """Render the base system prompt, cached per memory context.
+
+    A user's memory context is stable across turns within a session, so
+    the multi-KB format result is reused instead of rebuilt every call.
+    """
+    return SYSTEM_PROMPT.format(memory_context=memory_context)
+
+
+def _build_system_content(memory_context: str, tool_context: str) -> str:
+    """Assemble the system prompt from memory context and tool results."""
+    system_content = (
+        _SYSTEM_PROMPT_EMPTY if not memory_context
+        else _render_system_prompt(memory_context)
     )
-    
-    # Add tool context if available
     if tool_context:
-        tool_instructions = """
+        system_content = "".join((system_content, TOOL_INSTRUCTIONS, tool_context))
+    return system_content
 
-=== CRITICAL: TOOL RESULTS PROVIDED - YOU MUST USE THEM ===
 
-You have been given REAL-TIME search results and/or document content below.
-Your response MUST follow these rules:
+def _token_usage_from_metadata(message) -> dict:
+    """Extract token usage from provider metadata on a message or chunk."""
+    # Groq puts usage in response_metadata (on the last chunk when streaming)
+    if hasattr(message, "response_metadata") and message.response_metadata:
+        usage = message.response_metadata.get("token_usage", {})
+        if usage:
+            return {
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0),
+            }
+    # Also check usage_metadata (newer langchain-core versions)
+    if hasattr(message, "usage_metadata") and message.usage_metadata:
+        um = message.usage_metadata
+        if hasattr(um, "input_tokens") and um.input_tokens:
+            return {
+                "prompt_tokens": um.input_tokens,
+                "completion_tokens": um.output_tokens or 0,
+                "total_tokens": (um.input_tokens or 0) + (um.output_tokens or 0),
+            }
+    return {}
 
-1. **USE THE DATA**: Extract specific facts, dates, names, and details from the results.
-2. **CITE SOURCES**: When stating facts from search results, include the source URL.
-   Format: "According to [Source Name](URL), ..."
-3. **BE SPECIFIC**: Include exact dates, times, locations, and details found in the results.
-4. **NO GENERIC RESPONSES**: Do NOT say things like "check the official website" or 
-   "I don't have current information" - THE RESULTS BELOW ARE CURRENT.
-5. **ACKNOWLEDGE LIMITATIONS**: If the results don't contain the answer, say exactly what 
-   information IS available and what is missing.
 
-FORBIDDEN RESPONSES:
-- "I recommend checking [website] for the latest information"
-- "I don't have access to real-time data"
-- "As of my knowledge cutoff..."
-- Generic advice without specific facts from the results
+def _token_usage_fallback(messages: list, completion_text: str) -> dict:
+    """Count token usage with tiktoken when the provider didn't supply it."""
+    from utils.token_counter import count_tokens, count_messages_tokens
+    prompt_tokens = count_messages_tokens(messages)
+    completion_tokens = count_tokens(completion_text)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
 
-REQUIRED FORMAT:
-- Lead with the direct answer using facts from the results
-- Cite at least one source URL
-- Add relevant context from other results if available
 
-"""
-        system_content += tool_instructions + tool_context
+def generate_response(state: ChatState) -> dict:
+    """Generate a response using the LLM."""
+    model_name = state["model_name"]
+    memory_context = state.get("memory_context", "")
+    tool_context = state.get("tool_context", "")
+    tool_metadata = state.get("tool_metadata", {})
+    
+    # Build system message with memory and tool context
+    system_content = _build_system_content(memory_context, tool_context)
     
     # Get the LLM
     llm = get_llm(model_name=model_name, streaming=False)
@@ -150,35 +225,10 @@ REQUIRED FORMAT:
     # Generate response
     response = llm.invoke(messages)
     
-    # Extract token usage from Groq response metadata
-    token_usage = {}
-    if hasattr(response, "response_metadata") and response.response_metadata:
-        usage = response.response_metadata.get("token_usage", {})
-        if usage:
-            token_usage = {
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            }
-    # Also check usage_metadata (newer langchain-core versions)
-    if not token_usage and hasattr(response, "usage_metadata") and response.usage_metadata:
-        um = response.usage_metadata
-        if hasattr(um, "input_tokens") and um.input_tokens:
-            token_usage = {
-                "prompt_tokens": um.input_tokens,
-                "completion_tokens": um.output_tokens or 0,
-                "total_tokens": (um.input_tokens or 0) + (um.output_tokens or 0),
-            }
-    # Fallback: count with tiktoken if provider didn't supply usage
+    # Extract token usage from provider metadata, with tiktoken fallback
+    token_usage = _token_usage_from_metadata(response)
     if not token_usage or not token_usage.get("total_tokens"):
-        from utils.token_counter import count_tokens, count_messages_tokens
-        prompt_tokens = count_messages_tokens(messages)
-        completion_tokens = count_tokens(response.content)
-        token_usage = {
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "total_tokens": prompt_tokens + completion_tokens,
-        }
+        token_usage = _token_usage_fallback(messages, response.content)
         print(f"[TokenUsage] Fallback tiktoken count: {token_usage}", flush=True)
     else:
         print(f"[TokenUsage] From provider metadata: {token_usage}", flush=True)
@@ -190,46 +240,113 @@ REQUIRED FORMAT:
     }
 
 
+# Cheap pre-filter for memory extraction: only first-person statements
+# ("I am...", "my name is...", "we work at...") can yield personal facts,
+# so skip the extraction LLM call for everything else. Tune the verb list
+# rather than the structure if extraction misses facts.
+_PERSONAL_FACT_RE = re.compile(
+    r"\b(?:I|I'm|my|me|mine|we|our)\b"
+    r".{0,80}?"
+    r"\b(?:am|is|are|was|work|live|like|prefer|use|have|want|need|love|hate|born|from|name|call)\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+# Memory extraction runs on a single background worker thread so the
+# extraction LLM call never serializes behind the main response. The graph
+# node only enqueues; overflow is dropped rather than blocking a chat turn.
+_extraction_queue: queue.Queue = queue.Queue(maxsize=256)
+_extraction_worker_lock = threading.Lock()
+_extraction_worker_started = False
+
+
+@lru_cache(maxsize=256)
+def _format_extraction_prompt(user_message: str, assistant_response: str) -> str:
+    """Format the extraction prompt, memoized to dedupe identical retries."""
+    return MEMORY_EXTRACTION_PROMPT.format(
+        user_message=user_message,
+        assistant_response=assistant_response,
+    )
+
+
+def _run_extraction(user_id: str, user_message: str, assistant_response: str) -> None:
+    """Run one extraction LLM call and persist any facts it finds."""
+    # Use a fast model for extraction
+    llm = get_llm(model_name="llama-3.1-8b-instant", streaming=False)
+
+    extraction_prompt = _format_extraction_prompt(user_message, assistant_response)
+    result = llm.invoke([HumanMessage(content=extraction_prompt)])
+
+    facts = extract_facts_from_response(result.content)
+    if facts:
+        memory_manager = get_memory_manager(user_id)
+        memory_manager.save_facts_batch(facts, source="conversation")
+
+
+def _extraction_worker() -> None:
+    """Drain the extraction queue forever on a daemon thread."""
+    while True:
+        user_id, user_message, assistant_response = _extraction_queue.get()
+        try:
+            _run_extraction(user_id, user_message, assistant_response)
+        except Exception:
+            # Don't let one bad item kill the worker
+            logger.exception("Memory extraction failed for user %s", user_id)
+        finally:
+            _extraction_queue.task_done()
+
+
+def _ensure_extraction_worker() -> None:
+    """Start the extraction worker thread the first time it's needed."""
+    global _extraction_worker_started
+    if _extraction_worker_started:
+        return
+    with _extraction_worker_lock:
+        if _extraction_worker_started:
+            return
+        thread = threading.Thread(
+            target=_extraction_worker, name="memory-extraction", daemon=True
+        )
+        thread.start()
+        _extraction_worker_started = True
+
+
 def extract_memories(state: ChatState) -> dict:
-    """Extract facts from the conversation and save to long-term memory."""
+    """Queue fact extraction from the conversation for background processing."""
     user_id = state["user_id"]
     user_message = state.get("last_user_message", "")
     assistant_response = state.get("last_assistant_response", "")
-    
+
     # Skip extraction if no meaningful user message
     if not user_message or len(user_message) < 10:
         return {}
-    
+
     # Skip for very short exchanges
     if len(user_message) + len(assistant_response) < 50:
         return {}
-    
+
+    # Skip the extraction LLM call when the message has no first-person
+    # statement — most turns are questions/chit-chat with nothing to extract
+    if not _PERSONAL_FACT_RE.search(user_message):
+        return {}
+
+    _ensure_extraction_worker()
     try:
-        # Use a fast model for extraction
-        llm = get_llm(model_name="llama-3.1-8b-instant", streaming=False)
-        
-        # Create extraction prompt
-        extraction_prompt = MEMORY_EXTRACTION_PROMPT.format(
-            user_message=user_message,
-            assistant_response=assistant_response,
-        )
-        
-        # Get extraction
-        result = llm.invoke([HumanMessage(content=extraction_prompt)])
-        
-        # Parse and save facts
-        facts = extract_facts_from_response(result.content)
-        
-        if facts:
-            memory_manager = MemoryManager(user_id)
-            memory_manager.save_facts_batch(facts, source="conversation")
-    except Exception:
-        # Don't fail the main flow if extraction fails
-        pass
-    
+        _extraction_queue.put_nowait((user_id, user_message, assistant_response))
+    except queue.Full:
+        # Extraction is best-effort; dropping beats blocking the chat turn
+        logger.warning("Extraction queue full; dropping item for user %s", user_id)
+
     return {}
 
 
+# Chunk coalescing for streaming: batch already-ready LLM chunks into one
+# yield to cut per-chunk ASGI/SSE overhead, flushing often enough that
+# streaming still feels smooth.
+_STREAM_COALESCE_CHUNKS = 4
+_STREAM_FLUSH_INTERVAL = 0.025  # seconds
+
+
 async def generate_response_stream(state: ChatState) -> AsyncIterator[str | dict]:
     """Generate a streaming response using the LLM.
     
@@ -240,41 +357,7 @@ async def generate_response_stream(state: ChatState) -> AsyncIterator[str | dict
     tool_context = state.get("tool_context", "")
     
     # Build system message with memory and tool context
-    system_content = SYSTEM_PROMPT.format(
-        memory_context=memory_context if memory_context else ""
-    )
-    
-    # Add tool context if available
-    if tool_context:
-        tool_instructions = """
-
-=== CRITICAL: TOOL RESULTS PROVIDED - YOU MUST USE THEM ===
-
-You have been given REAL-TIME search results and/or document content below.
-Your response MUST follow these rules:
-
-1. **USE THE DATA**: Extract specific facts, dates, names, and details from the results.
-2. **CITE SOURCES**: When stating facts from search results, include the source URL.
-   Format: "According to [Source Name](URL), ..."
-3. **BE SPECIFIC**: Include exact dates, times, locations, and details found in the results.
-4. **NO GENERIC RESPONSES**: Do NOT say things like "check the official website" or 
-   "I don't have current information" - THE RESULTS BELOW ARE CURRENT.
-5. **ACKNOWLEDGE LIMITATIONS**: If the results don't contain the answer, say exactly what 
-   information IS available and what is missing.
-
-FORBIDDEN RESPONSES:
-- "I recommend checking [website] for the latest information"
-- "I don't have access to real-time data"
-- "As of my knowledge cutoff..."
-- Generic advice without specific facts from the results
-
-REQUIRED FORMAT:
-- Lead with the direct answer using facts from the results
-- Cite at least one source URL
-- Add relevant context from other results if available
-
-"""
-        system_content += tool_instructions + tool_context
+    system_content = _build_system_content(memory_context, tool_context)
     
     # Get the LLM with streaming enabled
     llm = get_llm(model_name=model_name, streaming=True)
@@ -289,42 +372,35 @@ REQUIRED FORMAT:
     # Prepare messages with system prompt
     messages = [SystemMessage(content=system_content)] + trimmed_messages
     
-    # Stream the response and capture token usage from last chunk
+    # Stream the response and capture token usage from last chunk,
+    # coalescing small chunks to reduce per-yield transport overhead
     token_usage = {}
-    full_response_text = ""
+    response_chunks: list[str] = []
+    buf: list[str] = []
+    last_flush = time.monotonic()
     async for chunk in llm.astream(messages):
         # Try to extract token usage from chunk metadata (Groq sends on last chunk)
-        if hasattr(chunk, "response_metadata") and chunk.response_metadata:
-            usage = chunk.response_metadata.get("token_usage", {})
-            if usage:
-                token_usage = {
-                    "prompt_tokens": usage.get("prompt_tokens", 0),
-                    "completion_tokens": usage.get("completion_tokens", 0),
-                    "total_tokens": usage.get("total_tokens", 0),
-                }
-        # Also check usage_metadata (newer langchain-core versions)
-        if not token_usage and hasattr(chunk, "usage_metadata") and chunk.usage_metadata:
-            um = chunk.usage_metadata
-            if hasattr(um, "input_tokens") and um.input_tokens:
-                token_usage = {
-                    "prompt_tokens": um.input_tokens,
-                    "completion_tokens": um.output_tokens or 0,
-                    "total_tokens": (um.input_tokens or 0) + (um.output_tokens or 0),
-                }
+        chunk_usage = _token_usage_from_metadata(chunk)
+        if chunk_usage:
+            token_usage = chunk_usage
         if chunk.content:
-            full_response_text += chunk.content
-            yield chunk.content
-    
+            response_chunks.append(chunk.content)
+            buf.append(chunk.content)
+            now = time.monotonic()
+            if len(buf) >= _STREAM_COALESCE_CHUNKS or now - last_flush >= _STREAM_FLUSH_INTERVAL:
+                yield "".join(buf)
+                buf.clear()
+                last_flush = now
+
+    # Final flush of any buffered tail
+    if buf:
+        yield "".join(buf)
+
+    full_response_text = "".join(response_chunks)
+
     # Fallback: if provider didn't supply token usage, count with tiktoken
     if not token_usage or not token_usage.get("total_tokens"):
-        from utils.token_counter import count_tokens, count_messages_tokens
-        prompt_tokens = count_messages_tokens(messages)
-        completion_tokens = count_tokens(full_response_text)
-        token_usage = {
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "total_tokens": prompt_tokens + completion_tokens,
-        }
+        token_usage = _token_usage_fallback(messages, full_response_text)
         print(f"[TokenUsage] Fallback tiktoken count: {token_usage}", flush=True)
     else:
         print(f"[TokenUsage] From provider metadata: {token_usage}", flush=True)
@@ -348,9 +424,11 @@ def create_chat_graph() -> StateGraph:
     builder.add_node("generate_response", generate_response)
     builder.add_node("extract_memories", extract_memories)
     
-    # Add edges: load_memory -> load_tools -> generate -> extract -> end
+    # Memory and tool loading are independent I/O — run them as parallel
+    # branches that both join into generate_response
     builder.add_edge(START, "load_memory")
-    builder.add_edge("load_memory", "load_tool_context")
+    builder.add_edge(START, "load_tool_context")
+    builder.add_edge("load_memory", "generate_response")
     builder.add_edge("load_tool_context", "generate_response")
     builder.add_edge("generate_response", "extract_memories")
     builder.add_edge("extract_memories", END)
@@ -360,10 +438,62 @@ def create_chat_graph() -> StateGraph:
     return builder.compile(checkpointer=checkpointer)
 
 
+# Cached compiled graph — building and compiling the graph is pure repeated
+# work per request; per-thread state is handled via configurable.thread_id.
+_compiled_graph = None
+
+
+def _get_compiled_graph():
+    """Get the compiled chat graph, building it once on first use."""
+    global _compiled_graph
+    if _compiled_graph is None:
+        _compiled_graph = create_chat_graph()
+    return _compiled_graph
+
+
+# Background persistence tasks — kept in a set so they aren't garbage
+# collected before completion
+_background_tasks: set = set()
+
+
 # ============================================================================
 # Convenience Functions
 # ============================================================================
 
+def _make_initial_state(
+    messages: list,
+    user_id: str,
+    conversation_id: str,
+    model_name: str | None,
+    tool_mode: str,
+    use_rag: bool,
+    last_user_message: str,
+    last_assistant_response: str = "",
+    memory_context: str = "",
+    tool_context: str = "",
+    tool_metadata: dict | None = None,
+) -> dict:
+    """Build a full graph state dict with consistent defaults.
+
+    Keeping a single constructor prevents the invoke and stream paths
+    from drifting on which keys they seed.
+    """
+    return dict(
+        messages=messages,
+        user_id=user_id,
+        model_name=model_name or DEFAULT_MODEL,
+        memory_context=memory_context,
+        last_user_message=last_user_message,
+        last_assistant_response=last_assistant_response,
+        tool_context=tool_context,
+        tool_mode=tool_mode,
+        use_rag=use_rag,
+        conversation_id=conversation_id,
+        tool_metadata=tool_metadata if tool_metadata is not None else {},
+        token_usage={},
+    )
+
+
 def invoke_chat(
     message: str,
     user_id: str,
@@ -386,27 +516,33 @@ def invoke_chat(
     Returns:
         Tuple of (response_text, all_messages, tool_metadata, token_usage)
     """
-    from config import DEFAULT_MODEL
-    
-    graph = create_chat_graph()
-    
+    # Check the semantic cache before invoking the LLM
+    cache = get_response_cache()
+    cache_key = (user_id, model_name or DEFAULT_MODEL, tool_mode, use_rag)
+    query_embedding = cache.embed(message) if cache.enabled else None
+    if query_embedding is not None:
+        cached_response = cache.get(cache_key, query_embedding, conversation_id)
+        if cached_response is not None:
+            messages = [
+                HumanMessage(content=message),
+                AIMessage(content=cached_response),
+            ]
+            return cached_response, messages, {}, {}
+
+    graph = _get_compiled_graph()
+
     config = {"configurable": {"thread_id": conversation_id}}
-    
+
     result = graph.invoke(
-        {
-            "messages": [HumanMessage(content=message)],
-            "user_id": user_id,
-            "model_name": model_name or DEFAULT_MODEL,
-            "memory_context": "",
-            "last_user_message": "",
-            "last_assistant_response": "",
-            "tool_context": "",
-            "tool_mode": tool_mode,
-            "use_rag": use_rag,
-            "conversation_id": conversation_id,
-            "tool_metadata": {},
-            "token_usage": {},
-        },
+        _make_initial_state(
+            messages=[HumanMessage(content=message)],
+            user_id=user_id,
+            conversation_id=conversation_id,
+            model_name=model_name,
+            tool_mode=tool_mode,
+            use_rag=use_rag,
+            last_user_message=message,
+        ),
         config=config,
     )
     
@@ -415,7 +551,19 @@ def invoke_chat(
     response = messages[-1].content if messages else ""
     tool_metadata = result.get("tool_metadata", {})
     token_usage = result.get("token_usage", {})
-    
+
+    # Populate the semantic cache for future paraphrased queries. Tool-
+    # grounded answers are excluded: search results expire from the search
+    # cache after minutes and RAG answers go stale as soon as another
+    # document lands in the conversation, while entries here have no TTL.
+    if (
+        query_embedding is not None
+        and response
+        and not tool_metadata.get("search_used")
+        and not tool_metadata.get("rag_used")
+    ):
+        cache.put(cache_key, query_embedding, response, conversation_id)
+
     return response, messages, tool_metadata, token_usage
 
 
@@ -441,18 +589,28 @@ async def stream_chat(
     Yields:
         Response chunks as they're generated, then metadata dicts
     """
-    from config import DEFAULT_MODEL
-    from agent.tools import get_tool_context
-    
-    # Debug logging
-    print(f"[stream_chat] Called with:")
-    print(f"  - message: {message[:50]}...")
-    print(f"  - conversation_id: {conversation_id}")
-    print(f"  - tool_mode: {tool_mode}")
-    print(f"  - use_rag: {use_rag}")
-    
+    logger.debug(
+        "stream_chat called: conversation_id=%s tool_mode=%s use_rag=%s message=%.50s",
+        conversation_id, tool_mode, use_rag, message,
+    )
+
+    # Check the semantic cache before doing any LLM work. cache.embed is
+    # a synchronous Ollama round trip, so keep it off the event loop like
+    # the other blocking context calls below.
+    cache = get_response_cache()
+    cache_key = (user_id, model_name or DEFAULT_MODEL, tool_mode, use_rag)
+    query_embedding = await asyncio.to_thread(cache.embed, message) if cache.enabled else None
+    if query_embedding is not None:
+        cached_response = cache.get(cache_key, query_embedding, conversation_id)
+        if cached_response is not None:
+            logger.debug("stream_chat semantic cache hit for conversation %s", conversation_id)
+            for start in range(0, len(cached_response), 200):
+                yield cached_response[start:start + 200]
+            yield {"tool_metadata": {}, "token_usage": {}}
+            return
+
     # Load conversation history from checkpointer for multi-turn context
-    graph = create_chat_graph()
+    graph = _get_compiled_graph()
     config = {"configurable": {"thread_id": conversation_id}}
     
     prior_messages = []
@@ -460,26 +618,39 @@ async def stream_chat(
         checkpoint_state = graph.get_state(config)
         if checkpoint_state and checkpoint_state.values:
             prior_messages = checkpoint_state.values.get("messages", [])
-            print(f"[stream_chat] Loaded {len(prior_messages)} prior messages from checkpointer", flush=True)
+            logger.debug("stream_chat loaded %d prior messages from checkpointer", len(prior_messages))
     except Exception as e:
-        print(f"[stream_chat] Could not load prior messages: {e}", flush=True)
-    
-    # First, load memories
-    memory_manager = MemoryManager(user_id)
-    memory_context = memory_manager.get_context_memories(query=message, limit=10)
-    
-    # Load tool context (search and/or RAG)
-    print(f"[stream_chat] Calling get_tool_context with tool_mode={tool_mode}")
-    tool_context, tool_metadata = get_tool_context(
-        query=message,
-        conversation_id=conversation_id,
-        tool_mode=tool_mode,
-        use_rag=use_rag,
-    )
-    print(f"[stream_chat] Got tool_context length: {len(tool_context)}, metadata: {tool_metadata}")
+        logger.warning("stream_chat could not load prior messages: %s", e)
+    
+    # Load memories and tool context concurrently — they are independent
+    # I/O calls, so pre-LLM latency drops to the slower of the two
+    memory_manager = get_memory_manager(user_id)
+    if tool_mode == "none" and not use_rag:
+        # Tools fully disabled — skip the tool round-trip entirely
+        memory_context = await asyncio.to_thread(
+            memory_manager.get_context_memories, query=message, limit=10
+        )
+        tool_context, tool_metadata = "", {}
+    else:
+        memory_context, (tool_context, tool_metadata) = await asyncio.gather(
+            asyncio.to_thread(memory_manager.get_context_memories, query=message, limit=10),
+            asyncio.to_thread(
+                get_tool_context,
+                query=message,
+                conversation_id=conversation_id,
+                tool_mode=tool_mode,
+                use_rag=use_rag,
+            ),
+        )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "stream_chat tool_context length=%d metadata=%s", len(tool_context), tool_metadata
+        )
     
-    # Build message list: prior conversation + new user message
-    all_messages = prior_messages + [HumanMessage(content=message)]
+    # Build message list: prior conversation + new user message. The message
+    # object is reused by the persistence state below rather than rebuilt.
+    user_message = HumanMessage(content=message)
+    all_messages = prior_messages + [user_message]
     
     # Create state
     state = ChatState(
@@ -498,37 +669,57 @@ async def stream_chat(
     )
     
     # Stream the response
-    full_response = ""
+    response_chunks: list[str] = []
     token_usage = {}
     async for chunk in generate_response_stream(state):
         # Check if this is the token_usage dict from the end of stream
         if isinstance(chunk, dict) and "token_usage" in chunk:
             token_usage = chunk["token_usage"]
             continue
-        full_response += chunk
+        response_chunks.append(chunk)
         yield chunk
-    
+
+    full_response = "".join(response_chunks)
+
     # Yield tool metadata and token usage at the end
     yield {"tool_metadata": tool_metadata, "token_usage": token_usage}
-    
-    # After streaming, save to graph for persistence and extract memories
-    graph.invoke(
-        {
-            "messages": [
-                HumanMessage(content=message),
-                AIMessage(content=full_response),
-            ],
-            "user_id": user_id,
-            "model_name": model_name or DEFAULT_MODEL,
-            "memory_context": memory_context,
-            "last_user_message": message,
-            "last_assistant_response": full_response,
-            "tool_context": tool_context,
-            "tool_mode": tool_mode,
-            "use_rag": use_rag,
-            "conversation_id": conversation_id,
-            "tool_metadata": tool_metadata,
-            "token_usage": {},
-        },
-        config=config,
+
+    # Populate the semantic cache for future paraphrased queries, skipping
+    # search- and document-grounded answers that would outlive their sources
+    if (
+        query_embedding is not None
+        and full_response
+        and not tool_metadata.get("search_used")
+        and not tool_metadata.get("rag_used")
+    ):
+        cache.put(cache_key, query_embedding, full_response, conversation_id)
+
+    # After streaming, persist to the graph and extract memories in the
+    # background — the client already has its full response, so there is
+    # no reason to hold the connection for checkpoint writes
+    persist_state = _make_initial_state(
+        messages=[
+            user_message,
+            AIMessage(content=full_response),
+        ],
+        user_id=user_id,
+        conversation_id=conversation_id,
+        model_name=model_name,
+        tool_mode=tool_mode,
+        use_rag=use_rag,
+        last_user_message=message,
+        last_assistant_response=full_response,
+        memory_context=memory_context,
+        tool_context=tool_context,
+        tool_metadata=tool_metadata,
     )
+
+    async def _persist_and_extract():
+        try:
+            await asyncio.to_thread(graph.invoke, persist_state, config=config)
+        except Exception:
+            logger.exception("stream_chat background persistence failed")
+
+    task = asyncio.create_task(_persist_and_extract())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -6,28 +6,40 @@ from functools import lru_cache
 
 from langchain_groq import ChatGroq
 
-from config import get_settings, AVAILABLE_MODELS, DEFAULT_MODEL
+from config import get_settings, AVAILABLE_MODELS, MODELS_BY_ID, DEFAULT_MODEL
+
+_VALID_MODEL_IDS = frozenset(MODELS_BY_ID)
 
 
 def get_llm(model_name: str | None = None, streaming: bool = False) -> ChatGroq:
     """
-    Create a Groq LLM instance with the specified model.
-    
+    Get a Groq LLM instance with the specified model.
+
+    Instances are cached per (model_name, streaming) so the underlying
+    HTTP connection pool is reused across requests instead of being
+    rebuilt on every chat turn. Unknown names are normalized to
+    DEFAULT_MODEL before the cache lookup, so arbitrary request input
+    can't evict the cached clients for real models.
+
     Args:
         model_name: The model identifier. Defaults to DEFAULT_MODEL.
         streaming: Whether to enable streaming responses.
-        
+
     Returns:
         Configured ChatGroq instance.
     """
-    settings = get_settings()
-    
     # Use default if not specified or invalid
-    if model_name is None:
-        model_name = DEFAULT_MODEL
-    elif not is_valid_model(model_name):
+    if model_name is None or not is_valid_model(model_name):
         model_name = DEFAULT_MODEL
     
+    return _build_llm(model_name, streaming)
+
+
+@lru_cache(maxsize=16)
+def _build_llm(model_name: str, streaming: bool) -> ChatGroq:
+    """Construct and cache a ChatGroq client for a validated model id."""
+    settings = get_settings()
+    
     return ChatGroq(
         api_key=settings.groq_api_key,
         model_name=model_name,
@@ -39,18 +51,15 @@ def get_llm(model_name: str | None = None, streaming: bool = False) -> ChatGroq:
 
 def is_valid_model(model_name: str) -> bool:
     """Check if the model name is valid."""
-    return any(m["id"] == model_name for m in AVAILABLE_MODELS)
+    return model_name in _VALID_MODEL_IDS
 
 
 def get_model_info(model_name: str) -> dict | None:
     """Get information about a specific model."""
-    for model in AVAILABLE_MODELS:
-        if model["id"] == model_name:
-            return model
-    return None
+    return MODELS_BY_ID.get(model_name)
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_available_models() -> list[dict]:
     """Get list of all available models."""
-    return AVAILABLE_MODELS.copy()
+    return list(AVAILABLE_MODELS)
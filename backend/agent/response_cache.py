@@ -0,0 +1,188 @@
+"""
+Semantic response cache keyed by query embedding.
+
+Serves repeated or paraphrased queries from cache instead of making a new
+LLM round-trip. Lookup embeds the incoming message and compares it against
+cached query embeddings (cosine similarity) scoped to
+(user_id, model_name, tool_mode), so responses never leak across users,
+models, or tool configurations.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """A single cached response with its unit-normalized query embedding."""
+    embedding: np.ndarray
+    response: str
+    conversation_id: str
+
+
+class SemanticResponseCache:
+    """
+    In-process semantic cache for full LLM responses.
+
+    Entries are keyed by (user_id, model_name, tool_mode) and matched by
+    cosine similarity of query embeddings against a configurable threshold.
+    A hit additionally requires the conversation to match, so answers that
+    depended on earlier turns aren't replayed out of context.
+    """
+
+    def __init__(self, threshold: float | None = None, max_entries: int | None = None):
+        settings = get_settings()
+        self.enabled = settings.semantic_cache_enabled
+        self.threshold = threshold if threshold is not None else settings.semantic_cache_threshold
+        self.max_entries = max_entries or settings.semantic_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, list[_CacheEntry]] = OrderedDict()
+        self._count = 0
+        self._lock = threading.Lock()
+        self._embeddings = None  # Lazy-loaded
+        # Memo of query -> unit vector; the Ollama embed call costs tens of
+        # ms, so repeat lookups of the same query text skip it entirely
+        self._embed_memo: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._embed_memo_max = 1024
+
+    def embed(self, text: str) -> np.ndarray | None:
+        """
+        Embed a query string, returning a unit-normalized vector.
+
+        Returns None if the embedding backend is unavailable so callers
+        can fall through to the normal LLM path.
+        """
+        memo_key = text.strip().lower()
+        with self._lock:
+            cached = self._embed_memo.get(memo_key)
+            if cached is not None:
+                self._embed_memo.move_to_end(memo_key)
+                return cached
+
+        try:
+            if self._embeddings is None:
+                from rag.store import get_embeddings
+                self._embeddings = get_embeddings()
+
+            vector = np.array(self._embeddings.embed_query(text), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return None
+            vector = vector / norm
+        except Exception as e:
+            logger.warning("Embedding failed, skipping cache: %s", e)
+            return None
+
+        with self._lock:
+            self._embed_memo[memo_key] = vector
+            self._embed_memo.move_to_end(memo_key)
+            while len(self._embed_memo) > self._embed_memo_max:
+                self._embed_memo.popitem(last=False)
+        return vector
+
+    def warm(self, queries: list[str]) -> None:
+        """
+        Pre-embed a list of queries on a background thread.
+
+        Intended for startup warmup with known-frequent queries so their
+        first live lookup skips the cold embed call.
+        """
+        if not self.enabled or not queries:
+            return
+
+        def _warm() -> None:
+            for query in queries:
+                self.embed(query)
+
+        threading.Thread(target=_warm, name="cache-warmup", daemon=True).start()
+
+    def get(
+        self,
+        key: tuple,
+        embedding: np.ndarray,
+        conversation_id: str,
+    ) -> str | None:
+        """Return the cached response for the nearest matching query, or None."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+
+            best_score = -1.0
+            best_entry = None
+            for entry in entries:
+                if entry.conversation_id != conversation_id:
+                    continue
+                score = float(np.dot(embedding, entry.embedding))
+                if score > best_score:
+                    best_score = score
+                    best_entry = entry
+
+            if best_entry is not None and best_score >= self.threshold:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return best_entry.response
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        key: tuple,
+        embedding: np.ndarray,
+        response: str,
+        conversation_id: str,
+    ) -> None:
+        """Cache a response under the given key, evicting oldest keys if full."""
+        if not response:
+            return
+
+        with self._lock:
+            entry = _CacheEntry(
+                embedding=embedding,
+                response=response,
+                conversation_id=conversation_id,
+            )
+            if key in self._entries:
+                self._entries[key].append(entry)
+                self._entries.move_to_end(key)
+            else:
+                self._entries[key] = [entry]
+            self._count += 1
+
+            # Evict least-recently-used keys to stay within budget
+            while self._count > self.max_entries and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._count -= len(evicted)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": self._count,
+                "threshold": self.threshold,
+            }
+
+
+# Singleton instance
+_response_cache: SemanticResponseCache | None = None
+
+
+def get_response_cache() -> SemanticResponseCache:
+    """Get the semantic response cache singleton."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = SemanticResponseCache()
+    return _response_cache
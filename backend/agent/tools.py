@@ -3,16 +3,64 @@ Agent Tools - Robust search tool with Tavily (httpx) and article reader.
 Based on proven implementation from task-6.
 """
 
+import asyncio
+import atexit
+import io
+import logging
 import re
-import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal, Optional
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup and its lxml backend are only needed once the reader
+# actually parses a page, so they're imported lazily — deployments that
+# never fetch articles skip the import cost entirely. lxml's C parser is
+# an order of magnitude faster than html.parser on large news pages.
+_HTML_PARSER: Optional[str] = None
+
+
+def _make_soup(html: str):
+    """Build a BeautifulSoup tree with the fastest available parser."""
+    global _HTML_PARSER
+    from bs4 import BeautifulSoup
+    if _HTML_PARSER is None:
+        try:
+            import lxml  # noqa: F401
+            _HTML_PARSER = "lxml"
+        except ImportError:
+            _HTML_PARSER = "html.parser"
+    return BeautifulSoup(html, _HTML_PARSER)
+
+
+# Shared connection-pooled HTTP client. A fresh httpx.Client per call paid
+# a TCP + TLS handshake on every Tavily search and article fetch; a
+# keep-alive pool reuses warm connections instead. Timeouts are passed per
+# request so each tool keeps its own budget. Async fetches create their own
+# AsyncClient per batch: pooled async connections are bound to the event
+# loop they were opened on, and fetch_articles spins up a fresh loop per
+# run, so a module-level async pool would hand out dead connections.
+_HTTPX_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_http_client = httpx.Client(limits=_HTTPX_LIMITS, follow_redirects=True)
+
+
+@atexit.register
+def _close_http_client() -> None:
+    """Close the pooled client on interpreter shutdown."""
+    try:
+        _http_client.close()
+    except Exception:
+        pass
+
 
 # ============================================================================
 # Data Classes for Tool Responses
@@ -42,6 +90,69 @@ class SearchResult:
 # Search Tool (Tavily via httpx - robust, never throws)
 # ============================================================================
 
+# Source-confidence markers, compiled once into single alternations so each
+# result is classified in one C-level scan instead of ~22 substring checks
+_HIGH_CONFIDENCE_DOMAINS = (
+    ".gov", ".edu", "nature.com", "science.org", "arxiv.org",
+    "pubmed", "ieee.org", "acm.org", "springer.com",
+    "bbc.com", "reuters.com", "apnews.com", "ufc.com",
+    "espn.com", "nytimes.com", "washingtonpost.com",
+)
+
+_LOW_CONFIDENCE_DOMAINS = (
+    "reddit.com", "quora.com", "medium.com", "blog",
+    "opinion", "forum",
+)
+
+_HIGH_CONFIDENCE_RE = re.compile("|".join(re.escape(d) for d in _HIGH_CONFIDENCE_DOMAINS))
+_LOW_CONFIDENCE_RE = re.compile("|".join(re.escape(d) for d in _LOW_CONFIDENCE_DOMAINS))
+
+
+class _TTLCache:
+    """Minimal thread-safe TTL-LRU used for tool-level result caching."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """Return the cached value, or None if missing/expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value) -> None:
+        """Store a value, evicting the oldest entries past maxsize."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Per-result block template for format_search_context; optional lines are
+# passed pre-rendered (or empty) so each result is one format call
+_RESULT_TMPL = "### [{i}] {title}\n{pub_line}Confidence: {confidence}\n{snippet_block}{url_line}\n"
+
+
+# Short-lived cache of successful Tavily responses so UI retries and quick
+# re-asks don't repeat the same paid API round trip
+_search_cache = _TTLCache(maxsize=128, ttl=300.0)
+
+# Even shorter-lived cache of assembled tool contexts; the TTL is kept small
+# so freshly uploaded RAG documents become visible within a minute
+_tool_context_cache = _TTLCache(maxsize=64, ttl=60.0)
+
 class SearchTool:
     """
     Web search using Tavily API via httpx.
@@ -55,29 +166,42 @@ class SearchTool:
         self.base_url = "https://api.tavily.com"
         self.timeout = 30.0
         self.max_retries = 2
+        # Resolved once so hot calls branch on a plain bool
+        self.configured = bool(self.api_key)
     
     def search(
         self,
         query: str,
         max_results: int = 5,
-        search_depth: str = "advanced",
-        include_answer: bool = True,
+        search_depth: str = "basic",
+        include_answer: bool = False,
         include_domains: Optional[list[str]] = None,
         exclude_domains: Optional[list[str]] = None,
     ) -> ToolResponse:
         """
         Execute a web search. Returns ToolResponse, never throws.
         """
-        if not self.api_key:
+        if not self.configured:
             return ToolResponse(
                 success=False,
                 error="TAVILY_API_KEY not configured",
                 retry_suggestion="Set TAVILY_API_KEY environment variable"
             )
         
-        print(f"[SearchTool] Executing search for: {query}", flush=True)
-        print(f"[SearchTool] API key present: {bool(self.api_key)}", flush=True)
-        sys.stdout.flush()
+        cache_key = (
+            query.strip().lower(),
+            max_results,
+            search_depth,
+            include_answer,
+            tuple(include_domains or ()),
+            tuple(exclude_domains or ()),
+        )
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("SearchTool cache hit for: %s", query)
+            return cached
+        
+        logger.debug("SearchTool executing search for: %s", query)
         
         for attempt in range(self.max_retries + 1):
             try:
@@ -95,13 +219,13 @@ class SearchTool:
                 if exclude_domains:
                     payload["exclude_domains"] = exclude_domains
                 
-                with httpx.Client(timeout=self.timeout) as client:
-                    response = client.post(
-                        f"{self.base_url}/search",
-                        json=payload
-                    )
+                response = _http_client.post(
+                    f"{self.base_url}/search",
+                    json=payload,
+                    timeout=self.timeout,
+                )
                 
-                print(f"[SearchTool] Response status: {response.status_code}", flush=True)
+                logger.debug("SearchTool response status: %s", response.status_code)
                 
                 if response.status_code == 429:
                     return ToolResponse(
@@ -136,16 +260,17 @@ class SearchTool:
                         "is_summary": True,
                     })
                 
-                for item in data.get("results", []):
-                    confidence = self._assess_confidence(item)
-                    
+                # Defensive bound: never process more items than requested,
+                # even if the API returns extras
+                for item in data.get("results", [])[:max_results]:
+                    url = item.get("url") or ""
                     results.append({
-                        "url": item.get("url", ""),
+                        "url": url,
                         "title": item.get("title", ""),
-                        "source": self._extract_domain(item.get("url", "")),
-                        "snippet": item.get("content", "")[:800],
+                        "source": self._extract_domain(url),
+                        "snippet": (item.get("content") or "")[:800],
                         "publication_date": item.get("published_date"),
-                        "confidence_hint": confidence,
+                        "confidence_hint": self._assess_confidence(item),
                         "is_summary": False,
                     })
                 
@@ -163,14 +288,16 @@ class SearchTool:
                         data=search_data
                     )
                 
-                print(f"[SearchTool] Found {len(results)} results", flush=True)
-                return ToolResponse(
+                logger.debug("SearchTool found %d results", len(results))
+                search_response = ToolResponse(
                     success=True,
                     data=search_data
                 )
+                _search_cache.put(cache_key, search_response)
+                return search_response
                 
             except httpx.TimeoutException:
-                print(f"[SearchTool] Timeout on attempt {attempt + 1}", flush=True)
+                logger.warning("SearchTool timeout on attempt %d", attempt + 1)
                 if attempt < self.max_retries:
                     continue
                 return ToolResponse(
@@ -179,7 +306,7 @@ class SearchTool:
                     retry_suggestion="Simplify query"
                 )
             except Exception as e:
-                print(f"[SearchTool] Error on attempt {attempt + 1}: {e}", flush=True)
+                logger.warning("SearchTool error on attempt %d: %s", attempt + 1, e)
                 if attempt < self.max_retries:
                     continue
                 return ToolResponse(
@@ -194,38 +321,61 @@ class SearchTool:
             retry_suggestion="Try a completely different approach"
         )
     
+    def extract(self, urls: list[str], extract_depth: str = "basic") -> ToolResponse:
+        """
+        Fetch cleaned content for several URLs in one batched Tavily call.
+        Returns ToolResponse with data={"contents": {url: raw_content}}.
+        """
+        if not self.configured:
+            return ToolResponse(
+                success=False,
+                error="TAVILY_API_KEY not configured",
+                retry_suggestion="Set TAVILY_API_KEY environment variable"
+            )
+        
+        try:
+            response = _http_client.post(
+                f"{self.base_url}/extract",
+                json={
+                    "api_key": self.api_key,
+                    "urls": urls,
+                    "extract_depth": extract_depth,
+                },
+                timeout=self.timeout,
+            )
+            
+            if response.status_code != 200:
+                return ToolResponse(
+                    success=False,
+                    error=f"API error: {response.status_code}"
+                )
+            
+            contents = {
+                item.get("url", ""): item.get("raw_content") or ""
+                for item in response.json().get("results", [])
+            }
+            return ToolResponse(success=True, data={"contents": contents})
+            
+        except httpx.TimeoutException:
+            return ToolResponse(success=False, error="Extract timeout")
+        except Exception as e:
+            return ToolResponse(success=False, error=f"Extract failed: {str(e)}")
+    
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
         try:
-            from urllib.parse import urlparse
             return urlparse(url).netloc
-        except:
+        except Exception:
             return ""
     
     def _assess_confidence(self, item: dict) -> str:
         """Assess confidence based on source characteristics."""
-        url = item.get("url", "").lower()
-        
-        high_confidence = [
-            ".gov", ".edu", "nature.com", "science.org", "arxiv.org",
-            "pubmed", "ieee.org", "acm.org", "springer.com",
-            "bbc.com", "reuters.com", "apnews.com", "ufc.com",
-            "espn.com", "nytimes.com", "washingtonpost.com"
-        ]
-        
-        low_confidence = [
-            "reddit.com", "quora.com", "medium.com", "blog",
-            "opinion", "forum"
-        ]
-        
-        for domain in high_confidence:
-            if domain in url:
-                return "HIGH"
-        
-        for domain in low_confidence:
-            if domain in url:
-                return "LOW"
-        
+        url = (item.get("url") or "").lower()
+
+        if _HIGH_CONFIDENCE_RE.search(url):
+            return "HIGH"
+        if _LOW_CONFIDENCE_RE.search(url):
+            return "LOW"
         return "MEDIUM"
 
 
@@ -233,6 +383,18 @@ class SearchTool:
 # Reader Tool (Article Fetcher & Parser)
 # ============================================================================
 
+# Article pages can run to several MB; content past this point is discarded
+# after text extraction anyway, so stop downloading and parsing there
+_MAX_ARTICLE_BYTES = 1_000_000
+
+# Candidate containers for the main article body, most specific first;
+# matches come back in document order from a single combined-selector walk
+_ARTICLE_SELECTOR = (
+    "article, [role='main'], .post-content, .article-content, "
+    ".entry-content, .content, main"
+)
+
+
 class ReaderTool:
     """
     Fetches and parses web articles to extract detailed content.
@@ -248,12 +410,17 @@ class ReaderTool:
             "Accept-Language": "en-US,en;q=0.5",
         }
     
-    def fetch_article(self, url: str, snippet_fallback: Optional[str] = None) -> ToolResponse:
+    def fetch_article(
+        self,
+        url: str,
+        snippet_fallback: Optional[str] = None,
+        max_chars: int = 10000,
+    ) -> ToolResponse:
         """
         Fetch and parse article content. Returns ToolResponse, never throws.
         """
         try:
-            result = self._fetch_with_httpx(url)
+            result = self._fetch_with_httpx(url, max_chars)
             if result.success:
                 return result
         except Exception:
@@ -277,19 +444,144 @@ class ReaderTool:
             retry_suggestion="Try a different source"
         )
     
-    def _fetch_with_httpx(self, url: str) -> ToolResponse:
-        """Primary fetch method using httpx + BeautifulSoup."""
+    async def fetch_article_async(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        snippet_fallback: Optional[str] = None,
+        max_chars: int = 10000,
+    ) -> ToolResponse:
+        """Async variant of fetch_article for concurrent multi-URL reads."""
         try:
-            with httpx.Client(timeout=self.timeout, follow_redirects=True) as client:
-                response = client.get(url, headers=self.headers)
+            result = await self._fetch_with_httpx_async(url, client, max_chars)
+            if result.success:
+                return result
+        except Exception:
+            pass
+        
+        # Final fallback: use snippet if available
+        if snippet_fallback:
+            return ToolResponse(
+                success=True,
+                data={
+                    "url": url,
+                    "content": snippet_fallback,
+                    "title": "",
+                    "extraction_method": "SNIPPET_ONLY"
+                }
+            )
+        
+        return ToolResponse(
+            success=False,
+            error=f"Failed to fetch article: {url}",
+            retry_suggestion="Try a different source"
+        )
+    
+    def fetch_articles(
+        self,
+        candidates: list[tuple[str, Optional[str]]],
+        max_chars: int = 10000,
+    ) -> list[ToolResponse]:
+        """
+        Fetch several articles concurrently.
+        
+        Args:
+            candidates: List of (url, snippet_fallback) pairs
+            max_chars: Truncate each article's content at this length
             
-            if response.status_code != 200:
-                return ToolResponse(
-                    success=False,
-                    error=f"HTTP {response.status_code}"
+        Returns:
+            ToolResponses in the same order as candidates
+        """
+        async def _gather() -> list:
+            # The client lives and dies with this batch's event loop, so
+            # its pooled connections are never reused across loops
+            async with httpx.AsyncClient(
+                limits=_HTTPX_LIMITS, follow_redirects=True
+            ) as client:
+                return await asyncio.gather(
+                    *(
+                        self.fetch_article_async(url, client, snippet, max_chars)
+                        for url, snippet in candidates
+                    ),
+                    return_exceptions=True,
                 )
+        
+        try:
+            responses = asyncio.run(_gather())
+        except RuntimeError:
+            # Already inside a running event loop — fetch serially
+            return [self.fetch_article(url, snippet, max_chars) for url, snippet in candidates]
+        
+        return [
+            r if isinstance(r, ToolResponse)
+            else ToolResponse(success=False, error=str(r))
+            for r in responses
+        ]
+    
+    def _fetch_with_httpx(self, url: str, max_chars: int = 10000) -> ToolResponse:
+        """Primary fetch method using httpx + BeautifulSoup."""
+        try:
+            with _http_client.stream(
+                "GET", url, headers=self.headers, timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    return ToolResponse(
+                        success=False,
+                        error=f"HTTP {response.status_code}"
+                    )
+                
+                chunks = []
+                received = 0
+                for chunk in response.iter_bytes():
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= _MAX_ARTICLE_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
+            
+            html = b"".join(chunks).decode(encoding, errors="replace")
+            return self._parse_article(url, html, max_chars)
+            
+        except httpx.TimeoutException:
+            return ToolResponse(success=False, error="Timeout")
+        except Exception as e:
+            return ToolResponse(success=False, error=str(e))
+    
+    async def _fetch_with_httpx_async(
+        self, url: str, client: httpx.AsyncClient, max_chars: int = 10000
+    ) -> ToolResponse:
+        """Async fetch using the caller's pooled client; parsing is shared."""
+        try:
+            async with client.stream(
+                "GET", url, headers=self.headers, timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    return ToolResponse(
+                        success=False,
+                        error=f"HTTP {response.status_code}"
+                    )
+                
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= _MAX_ARTICLE_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            html = b"".join(chunks).decode(encoding, errors="replace")
+            return self._parse_article(url, html, max_chars)
+            
+        except httpx.TimeoutException:
+            return ToolResponse(success=False, error="Timeout")
+        except Exception as e:
+            return ToolResponse(success=False, error=str(e))
+    
+    def _parse_article(self, url: str, html: str, max_chars: int = 10000) -> ToolResponse:
+        """Extract title and main content from raw article HTML."""
+        try:
+            soup = _make_soup(html)
             
             # Remove unwanted elements
             for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
@@ -302,24 +594,13 @@ class ReaderTool:
             elif soup.find("h1"):
                 title = soup.find("h1").get_text(strip=True)
             
-            # Extract main content
+            # Extract main content: one combined-selector tree walk instead
+            # of one walk per candidate selector
             content = ""
-            article_selectors = [
-                "article",
-                '[role="main"]',
-                ".post-content",
-                ".article-content",
-                ".entry-content",
-                ".content",
-                "main",
-            ]
-            
-            for selector in article_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    content = element.get_text(separator="\n", strip=True)
-                    if len(content) > 200:
-                        break
+            for element in soup.select(_ARTICLE_SELECTOR):
+                content = element.get_text(separator="\n", strip=True)
+                if len(content) > 200:
+                    break
             
             # Fallback to body
             if len(content) < 200:
@@ -332,8 +613,8 @@ class ReaderTool:
             content = "\n".join(lines)
             
             # Truncate if too long
-            if len(content) > 10000:
-                content = content[:10000] + "...[truncated]"
+            if len(content) > max_chars:
+                content = content[:max_chars] + "...[truncated]"
             
             if len(content) < 100:
                 return ToolResponse(
@@ -351,8 +632,6 @@ class ReaderTool:
                 }
             )
             
-        except httpx.TimeoutException:
-            return ToolResponse(success=False, error="Timeout")
         except Exception as e:
             return ToolResponse(success=False, error=str(e))
 
@@ -361,17 +640,24 @@ class ReaderTool:
 # Search Heuristics
 # ============================================================================
 
-# Keywords and patterns that indicate a search might be needed
+# Keywords and patterns that indicate a search might be needed.
+# Ordered by observed hit frequency: the alternation short-circuits on the
+# first matching branch, so the common cases should come first.
 SEARCH_INDICATORS = [
-    # Time-sensitive queries
+    # Time-sensitive queries (by far the most frequent trigger)
     r"\b(today|yesterday|this week|this month|this year|202[0-9]|current|latest|recent|now|right now)\b",
-    r"\b(what is|what's|what are) .* (price|stock|weather|news|score)\b",
+    
+    # Explicit search-like commands
+    r"\b(search|look up|find|google|check)\b",
+    r"\b(tell me about|information about|info on)\b",
+    r"\b(what happened|what's happening)\b",
     
     # Real-time information
-    r"\b(weather|forecast|temperature)\b.*\b(in|at|for)\b",
     r"\b(news|headlines|latest)\b",
+    r"\b(weather|forecast|temperature)\b.*\b(in|at|for)\b",
     r"\b(stock|share|market|trading)\b.*\b(price|value)\b",
     r"\b(score|result|match|game)\b.*\b(of|between|vs)\b",
+    r"\b(what is|what's|what are) .* (price|stock|weather|news|score)\b",
     
     # Events and schedules
     r"\b(when is|when's|when will|when does|what date|exact date)\b",
@@ -382,11 +668,6 @@ SEARCH_INDICATORS = [
     r"\b(who is|who's) the (current|present)\b",
     r"\b(how much|how many|what is) .* (cost|worth|value)\b",
     r"\b(release date|coming out)\b",
-    
-    # Search-like queries
-    r"\b(search|look up|find|google|check)\b",
-    r"\b(tell me about|information about|info on)\b",
-    r"\b(what happened|what's happening)\b",
 ]
 
 # Keywords that explicitly suggest NO search needed
@@ -397,6 +678,32 @@ NO_SEARCH_INDICATORS = [
     r"\b(my|our|we|I)\b.*(document|pdf|file|upload)",
 ]
 
+# Precompiled alternations so should_use_search runs two C-level scans
+# instead of ~20 separate re.search calls per turn
+_SEARCH_RE = re.compile("|".join(f"(?:{p})" for p in SEARCH_INDICATORS), re.IGNORECASE)
+_NO_SEARCH_RE = re.compile("|".join(f"(?:{p})" for p in NO_SEARCH_INDICATORS), re.IGNORECASE)
+
+
+# Queries that benefit from Tavily's deeper crawl and synthesized answer;
+# plain factoid lookups get the faster, cheaper basic depth
+_DEEP_SEARCH_RE = re.compile(
+    r"\b(summarize|summary|overview|in depth|detailed|deep dive|"
+    r"what happened|what's happening|tell me about|information about)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_search_depth(query: str) -> tuple[str, bool]:
+    """
+    Choose (search_depth, include_answer) for a query.
+
+    Advanced depth with answer synthesis roughly doubles Tavily latency
+    and payload size, so it's reserved for broad/summary-style queries.
+    """
+    if _DEEP_SEARCH_RE.search(query):
+        return "advanced", True
+    return "basic", False
+
 
 def should_use_search(
     query: str,
@@ -409,18 +716,11 @@ def should_use_search(
         return True
     if tool_mode == "none":
         return False
-    
-    query_lower = query.lower()
-    
-    for pattern in NO_SEARCH_INDICATORS:
-        if re.search(pattern, query_lower):
-            return False
-    
-    for pattern in SEARCH_INDICATORS:
-        if re.search(pattern, query_lower):
-            return True
-    
-    return False
+
+    if _NO_SEARCH_RE.search(query):
+        return False
+
+    return _SEARCH_RE.search(query) is not None
 
 
 # ============================================================================
@@ -455,7 +755,24 @@ def format_search_context(search_response: ToolResponse, search_requested: bool
     """
     Format search results as context for the LLM.
     Forces grounded responses by providing explicit instructions.
+
+    The rendered string is memoized on the response object per
+    search_requested flag — cached ToolResponses live for minutes in the
+    search TTL cache, so repeat queries skip the re-render too.
     """
+    memo = getattr(search_response, "_format_memo", None)
+    if memo is None:
+        memo = {}
+        search_response._format_memo = memo
+    cached = memo.get(search_requested)
+    if cached is None:
+        cached = _render_search_context(search_response, search_requested)
+        memo[search_requested] = cached
+    return cached
+
+
+def _render_search_context(search_response: ToolResponse, search_requested: bool) -> str:
+    """Build the search-context string (uncached)."""
     if not search_response.success:
         error_msg = search_response.error or "Unknown error"
         if search_requested:
@@ -480,41 +797,154 @@ def format_search_context(search_response: ToolResponse, search_requested: bool
             )
         return ""
     
-    context_parts = [
-        f"**WEB SEARCH RESULTS FOR: \"{query}\"**\n",
+    # Build the context in one contiguous buffer instead of a list of
+    # short strings plus a join pass
+    buf = io.StringIO()
+    buf.write(f"**WEB SEARCH RESULTS FOR: \"{query}\"**\n\n")
+    buf.write(
         "INSTRUCTION: You MUST use these search results to answer. "
-        "Cite specific sources with URLs. Do NOT give generic responses.",
-        ""
-    ]
+        "Cite specific sources with URLs. Do NOT give generic responses.\n\n"
+    )
     
     for i, result in enumerate(results, 1):
         if result.get("is_summary"):
-            context_parts.append(f"### Tavily Summary:\n{result['snippet']}\n")
+            buf.write(f"### Tavily Summary:\n{result['snippet']}\n\n")
         else:
-            title = result.get("title", f"Result {i}")
             snippet = result.get("snippet", "")
             url = result.get("url", "")
             pub_date = result.get("publication_date")
-            confidence = result.get("confidence_hint", "MEDIUM")
             
-            context_parts.append(f"### [{i}] {title}")
-            if pub_date:
-                context_parts.append(f"Published: {pub_date}")
-            context_parts.append(f"Confidence: {confidence}")
-            if snippet:
-                context_parts.append(f"\n{snippet}")
-            if url:
-                context_parts.append(f"\nSource URL: {url}")
-            context_parts.append("")
+            buf.write(_RESULT_TMPL.format(
+                i=i,
+                title=result.get("title", f"Result {i}"),
+                pub_line=f"Published: {pub_date}\n" if pub_date else "",
+                confidence=result.get("confidence_hint", "MEDIUM"),
+                snippet_block=f"\n{snippet}\n" if snippet else "",
+                url_line=f"\nSource URL: {url}\n" if url else "",
+            ))
     
-    context_parts.append(
+    buf.write(
         "\n---\n"
         "IMPORTANT: Base your answer on the information above. "
         "Include specific dates, facts, and cite source URLs. "
         "If information is missing from results, say so explicitly."
     )
     
-    return "\n".join(context_parts)
+    return buf.getvalue()
+
+
+def _build_search_context(query: str, search_explicitly_requested: bool) -> tuple[list, dict]:
+    """
+    Run the web-search branch of tool context building.
+
+    Returns (context_parts, metadata updates) so it can run on a worker
+    thread concurrently with RAG retrieval.
+    """
+    context_parts = []
+    metadata = {"search_used": False, "search_query": query}
+
+    search_tool = get_search_tool()
+    search_depth, include_answer = classify_search_depth(query)
+    search_response = search_tool.search(
+        query,
+        search_depth=search_depth,
+        include_answer=include_answer,
+    )
+
+    logger.debug(
+        "Tools search response: success=%s error=%s",
+        search_response.success, search_response.error,
+    )
+
+    # When search is explicitly requested, always include context (even on failure)
+    if search_explicitly_requested:
+        metadata["search_used"] = True
+        search_context = format_search_context(search_response, search_requested=True)
+        if search_context:
+            context_parts.append(search_context)
+
+        # If we have results, try to fetch more details from top sources for exact info
+        if search_response.success and search_response.data:
+            results = search_response.data.get("results", [])
+            # Fetch full content from top non-summary results concurrently;
+            # wall time is the slowest fetch instead of the sum
+            fetch_candidates = [
+                r for r in results[:3]
+                if not r.get("is_summary") and r.get("url")
+            ]
+            detailed_parts = []
+
+            if fetch_candidates:
+                logger.debug("Tools fetching detailed content from %d sources", len(fetch_candidates))
+                # One batched Tavily extract call replaces per-URL page
+                # fetches; the reader fills in any URLs extract missed
+                contents: dict[str, str] = {}
+                extract_response = search_tool.extract([r["url"] for r in fetch_candidates])
+                if extract_response.success and extract_response.data:
+                    contents = extract_response.data.get("contents", {})
+                
+                missing = [r for r in fetch_candidates if not contents.get(r["url"])]
+                if missing:
+                    reader_tool = get_reader_tool()
+                    article_responses = reader_tool.fetch_articles(
+                        [(r["url"], r.get("snippet")) for r in missing],
+                        max_chars=2500,
+                    )
+                    for result, article_response in zip(missing, article_responses):
+                        if article_response.success and article_response.data:
+                            contents[result["url"]] = article_response.data.get("content", "")
+
+                for result in fetch_candidates:
+                    content = contents.get(result["url"], "")
+                    if content and len(content) > len(result.get("snippet", "")):
+                        # Extract relevant section (first 2000 chars that might contain dates/details)
+                        detailed_parts.append(
+                            f"\n### Detailed Content from {result.get('title', result['url'])}:\n"
+                            f"{content[:2000]}..."
+                        )
+
+                    # Only include 2 sources max to keep the context bounded
+                    if len(detailed_parts) >= 2:
+                        break
+
+            if detailed_parts:
+                context_parts.append("\n---\n**ADDITIONAL DETAILS FROM SOURCES:**" + "".join(detailed_parts))
+    else:
+        # Auto mode - only add context if we got good results
+        if search_response.success and search_response.data and search_response.data.get("results"):
+            search_context = format_search_context(search_response, search_requested=False)
+            if search_context:
+                context_parts.append(search_context)
+                metadata["search_used"] = True
+
+    return context_parts, metadata
+
+
+def _build_rag_context(query: str, conversation_id: str) -> tuple[list, dict]:
+    """Run the RAG branch of tool context building; mirrors the search branch."""
+    context_parts = []
+    metadata = {"rag_used": False, "rag_chunks": 0}
+
+    try:
+        from rag.retriever import get_rag_retriever
+
+        # A single retrieval covers the empty-conversation check, the
+        # context string and the chunk count; has_documents plus a second
+        # retrieve tripled the vector-store round trips
+        retriever = get_rag_retriever()
+        rag_context, chunks = retriever.get_context_and_chunks(query, conversation_id)
+        if rag_context:
+            context_parts.append(rag_context)
+            metadata["rag_used"] = True
+            metadata["rag_chunks"] = len(chunks)
+    except Exception as e:
+        logger.warning("Tools RAG retrieval error: %s", e)
+
+    return context_parts, metadata
+
+
+# Small pool for overlapping the web-search and RAG branches when both run
+_tool_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tool-ctx")
 
 
 def get_tool_context(
@@ -526,105 +956,69 @@ def get_tool_context(
     """
     Get combined tool context (search + RAG) for a query.
     """
-    print(f"[Tools] get_tool_context called with tool_mode={tool_mode}, use_rag={use_rag}", flush=True)
-    print(f"[Tools] Query: {query[:100]}...", flush=True)
-    sys.stdout.flush()
-    
-    context_parts = []
+    logger.debug(
+        "get_tool_context called: tool_mode=%s use_rag=%s query=%.100s",
+        tool_mode, use_rag, query,
+    )
+
+    cache_key = (query.strip().lower(), conversation_id, tool_mode, use_rag)
+    cached = _tool_context_cache.get(cache_key)
+    if cached is not None:
+        combined_context, metadata = cached
+        return combined_context, dict(metadata)
+
     metadata = {
         "search_used": False,
         "rag_used": False,
         "search_query": None,
         "rag_chunks": 0,
     }
-    
+
     search_explicitly_requested = tool_mode == "search"
     will_search = should_use_search(query, tool_mode)
-    print(f"[Tools] Search explicitly requested: {search_explicitly_requested}, Will search: {will_search}", flush=True)
-    
-    if will_search:
-        search_tool = get_search_tool()
-        search_response = search_tool.search(query)
-        metadata["search_query"] = query
-        
-        print(f"[Tools] Search response: success={search_response.success}, error={search_response.error}", flush=True)
-        
-        if search_response.success and search_response.data:
-            results = search_response.data.get("results", [])
-            print(f"[Tools] Got {len(results)} search results", flush=True)
-        
-        # When search is explicitly requested, always include context (even on failure)
-        if search_explicitly_requested:
-            metadata["search_used"] = True
-            search_context = format_search_context(search_response, search_requested=True)
-            if search_context:
-                context_parts.append(search_context)
-                
-            # If we have results, try to fetch more details from top sources for exact info
-            if search_response.success and search_response.data:
-                results = search_response.data.get("results", [])
-                # Fetch full content from top 2 non-summary results for detailed extraction
-                reader_tool = get_reader_tool()
-                detailed_parts = []
-                
-                for result in results[:3]:
-                    if result.get("is_summary"):
-                        continue
-                    url = result.get("url")
-                    if not url:
-                        continue
-                    
-                    print(f"[Tools] Fetching detailed content from: {url}", flush=True)
-                    article_response = reader_tool.fetch_article(url, result.get("snippet"))
-                    
-                    if article_response.success and article_response.data:
-                        content = article_response.data.get("content", "")
-                        if content and len(content) > len(result.get("snippet", "")):
-                            # Extract relevant section (first 2000 chars that might contain dates/details)
-                            detailed_parts.append(
-                                f"\n### Detailed Content from {result.get('title', url)}:\n"
-                                f"{content[:2000]}..."
-                            )
-                    
-                    # Only fetch from 2 sources max to avoid timeout
-                    if len(detailed_parts) >= 2:
-                        break
-                
-                if detailed_parts:
-                    context_parts.append("\n---\n**ADDITIONAL DETAILS FROM SOURCES:**" + "".join(detailed_parts))
-        else:
-            # Auto mode - only add context if we got good results
-            if search_response.success and search_response.data and search_response.data.get("results"):
-                search_context = format_search_context(search_response, search_requested=False)
-                if search_context:
-                    context_parts.append(search_context)
-                    metadata["search_used"] = True
-    
-    # Get RAG context if conversation has documents
-    if use_rag and conversation_id:
-        try:
-            from rag.retriever import get_rag_retriever
-            from rag.store import get_rag_store
-            
-            store = get_rag_store()
-            if store.has_documents(conversation_id):
-                retriever = get_rag_retriever()
-                rag_context = retriever.get_context(query, conversation_id)
-                if rag_context:
-                    context_parts.append(rag_context)
-                    metadata["rag_used"] = True
-                    chunks = retriever.retrieve(query, conversation_id)
-                    metadata["rag_chunks"] = len([c for c in chunks if c.get("score", 0) > 0.3])
-        except Exception as e:
-            print(f"[Tools] RAG retrieval error: {e}", flush=True)
-    
-    # Combine contexts
+    will_rag = bool(use_rag and conversation_id)
+    logger.debug(
+        "Tools search requested=%s will_search=%s will_rag=%s",
+        search_explicitly_requested, will_search, will_rag,
+    )
+
+    # Chit-chat turns with no documents attached need no tool work at all
+    if not will_search and not will_rag:
+        return "", metadata
+
+    search_parts: list = []
+    rag_parts: list = []
+
+    if will_search and will_rag:
+        # Web search and vector retrieval are independent; overlap them so
+        # tool-context latency is the slower of the two, not the sum
+        search_future = _tool_executor.submit(
+            _build_search_context, query, search_explicitly_requested
+        )
+        rag_parts, rag_meta = _build_rag_context(query, conversation_id)
+        search_parts, search_meta = search_future.result()
+        metadata.update(search_meta)
+        metadata.update(rag_meta)
+    elif will_search:
+        search_parts, search_meta = _build_search_context(query, search_explicitly_requested)
+        metadata.update(search_meta)
+    elif will_rag:
+        rag_parts, rag_meta = _build_rag_context(query, conversation_id)
+        metadata.update(rag_meta)
+
+    # Combine contexts: search results first, then document context
+    context_parts = search_parts + rag_parts
     combined_context = ""
     if context_parts:
         combined_context = "\n\n---\n\n".join(context_parts)
         combined_context = f"\n\n### Tool Results ###\n{combined_context}\n### End Tool Results ###\n"
-    
-    print(f"[Tools] Final metadata: {metadata}", flush=True)
-    sys.stdout.flush()
-    
+
+    logger.debug("Tools final metadata: %s", metadata)
+
+    # Don't negative-cache failures: if the search branch ran but produced
+    # nothing (timeout, API error), pinning that context for the TTL would
+    # suppress retries for a minute. Successful or search-free contexts
+    # are safe to cache.
+    if not will_search or metadata["search_used"]:
+        _tool_context_cache.put(cache_key, (combined_context, dict(metadata)))
     return combined_context, metadata
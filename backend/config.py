@@ -3,60 +3,59 @@ Configuration settings for T3.chat backend.
 Uses pydantic-settings for environment variable management.
 """
 
-import os
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
-from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
-# Explicitly load .env file from the backend directory
-_backend_dir = Path(__file__).parent
-_env_file = _backend_dir / ".env"
-load_dotenv(_env_file)
-
-# Debug: Print to verify env loading (remove after testing)
-import sys
-print(f"[Config] Loading .env from: {_env_file}", flush=True)
-print(f"[Config] TAVILY_API_KEY loaded: {'Yes' if os.getenv('TAVILY_API_KEY') else 'No'}", flush=True)
-sys.stdout.flush()
+# .env lives next to this module; pydantic-settings loads it natively
+_env_file = Path(__file__).parent / ".env"
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Groq API
-    groq_api_key: str = os.getenv("GROQ_API_KEY", "")
+    groq_api_key: str = ""
     
     # MongoDB (Atlas)
-    mongodb_url: str = os.getenv("MONGODB_URL")
-    database_name: str = os.getenv("DATABASE_NAME", "t3_chat")
+    mongodb_url: str
+    database_name: str = "t3_chat"
+    # Connection pool sizing and wire compression (zlib needs no extra deps;
+    # set e.g. "zstd,zlib" if zstandard is installed)
+    mongodb_max_pool_size: int = 50
+    mongodb_min_pool_size: int = 5
+    mongodb_compressors: str = "zlib"
     
     # LangSmith (optional)
-    langsmith_api_key: str = os.getenv("LANGSMITH_API_KEY", "")
-    langsmith_project: str = os.getenv("LANGSMITH_PROJECT", "t3-chat-clone")
-    langsmith_tracing: str = os.getenv("LANGSMITH_TRACING", "true")
-    langsmith_endpoint: str = os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com")
+    langsmith_api_key: str = ""
+    langsmith_project: str = "t3-chat-clone"
+    langsmith_tracing: str = "true"
+    langsmith_endpoint: str = "https://api.smith.langchain.com"
     
     # Tavily Search API
-    tavily_api_key: str = os.getenv("TAVILY_API_KEY", "")
+    tavily_api_key: str = ""
     
     # Ollama Embeddings
-    ollama_base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    ollama_embed_model: str = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+    ollama_base_url: str = "http://localhost:11434"
+    ollama_embed_model: str = "nomic-embed-text"
     
     # RAG Configuration
-    rag_chunk_size: int = int(os.getenv("RAG_CHUNK_SIZE", "1000"))
-    rag_chunk_overlap: int = int(os.getenv("RAG_CHUNK_OVERLAP", "200"))
-    rag_top_k: int = int(os.getenv("RAG_TOP_K", "5"))
+    rag_chunk_size: int = 1000
+    rag_chunk_overlap: int = 200
+    rag_top_k: int = 5
+    # Opt-in Atlas Vector Search; requires a "rag_vec" search index on
+    # rag_chunks (knnVector on "embedding", filter on "conversation_id")
+    rag_use_vector_search: bool = False
     
     # AWS S3 Configuration (for file storage)
-    aws_access_key_id: str = os.getenv("AWS_ACCESS_KEY_ID", "")
-    aws_secret_access_key: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
-    aws_region: str = os.getenv("AWS_REGION", "us-east-1")
-    s3_bucket_name: str = os.getenv("S3_BUCKET_NAME", "")
+    aws_access_key_id: str = ""
+    aws_secret_access_key: str = ""
+    aws_region: str = "us-east-1"
+    s3_bucket_name: str = ""
     # Optional: For S3-compatible services like MinIO, DigitalOcean Spaces, etc.
-    s3_endpoint_url: str = os.getenv("S3_ENDPOINT_URL", "")
+    s3_endpoint_url: str = ""
     
     @property
     def s3_configured(self) -> bool:
@@ -64,37 +63,42 @@ class Settings(BaseSettings):
         return bool(self.aws_access_key_id and self.aws_secret_access_key and self.s3_bucket_name)
     
     # Rate Limiting
-    rate_limit_per_hour: int = int(os.getenv("RATE_LIMIT_PER_HOUR", "60"))
+    rate_limit_per_hour: int = 60
+
+    # Semantic Response Cache
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_max_entries: int = 256
     
     # Context Window Management
-    context_reserve_tokens: int = int(os.getenv("CONTEXT_RESERVE_TOKENS", "512"))
-    max_output_tokens: int = int(os.getenv("MAX_OUTPUT_TOKENS", "4096"))
+    context_reserve_tokens: int = 512
+    max_output_tokens: int = 4096
     
     # CORS Configuration
     # Comma-separated list of allowed origins, or "*" for all (not recommended with credentials)
     # Include your Vercel frontend URL here
-    cors_origins: str = os.getenv(
-        "CORS_ORIGINS",
+    cors_origins: str = (
         "http://localhost:3000,http://127.0.0.1:3000,http://localhost:5173,https://t3chat-indol.vercel.app"
     )
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Parse CORS origins into a list."""
+        """Parse CORS origins into a list (computed once per instance)."""
         if self.cors_origins == "*":
             return ["*"]
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
     
     # Pydantic v2 configuration
     model_config = {
-        "env_file": ".env",
+        "env_file": str(_env_file),
         "env_file_encoding": "utf-8",
         "extra": "ignore",  # Ignore extra fields from .env file
     }
 
 
-# Available Groq Models
-AVAILABLE_MODELS = [
+# Available Groq Models (immutable catalog; entries stay dicts so they can
+# be unpacked straight into the ModelInfo response schema)
+AVAILABLE_MODELS = (
     {
         "id": "qwen/qwen3-32b",
         "name": "Qwen 3 32B",
@@ -143,12 +147,22 @@ AVAILABLE_MODELS = [
         "description": "Versatile Llama 3.3 70B model",
         "context_length": 128000,
     },
-]
+)
 
 DEFAULT_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
 
+# Auxiliary index so model lookups by id are a single hash probe instead of
+# a scan over AVAILABLE_MODELS. Read-only so it can be shared across
+# threads without defensive copies.
+MODELS_BY_ID = MappingProxyType({m["id"]: m for m in AVAILABLE_MODELS})
+
+
+def get_model(model_id: str) -> dict | None:
+    """Look up a model's catalog entry by id."""
+    return MODELS_BY_ID.get(model_id)
+
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
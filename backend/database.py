@@ -2,6 +2,9 @@
 MongoDB database connection and lifecycle management.
 """
 
+import asyncio
+import threading
+
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 
@@ -11,48 +14,77 @@ from config import get_settings
 # Global database instances
 _async_client: AsyncIOMotorClient | None = None
 _sync_client: MongoClient | None = None
+_async_db = None
+_sync_db = None
+
+# Guard first-time client creation: without a lock, concurrent cold-start
+# requests can each build a client and leak a whole connection pool
+_async_init_lock = asyncio.Lock()
+_sync_init_lock = threading.Lock()
+
+
+def _client_options(settings) -> dict:
+    """Shared pool-size and compression options for both Mongo clients."""
+    return {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "compressors": settings.mongodb_compressors,
+        "retryWrites": True,
+        "serverSelectionTimeoutMS": 5000,
+    }
 
 
 async def get_async_client() -> AsyncIOMotorClient:
     """Get the async MongoDB client, creating it if necessary."""
     global _async_client
     if _async_client is None:
-        settings = get_settings()
-        _async_client = AsyncIOMotorClient(settings.mongodb_url)
+        async with _async_init_lock:
+            if _async_client is None:
+                settings = get_settings()
+                _async_client = AsyncIOMotorClient(
+                    settings.mongodb_url, **_client_options(settings)
+                )
     return _async_client
 
 
 async def get_database():
-    """Get the async database instance."""
-    client = await get_async_client()
-    settings = get_settings()
-    return client[settings.database_name]
+    """Get the async database instance (cached after first access)."""
+    global _async_db
+    if _async_db is None:
+        client = await get_async_client()
+        _async_db = client[get_settings().database_name]
+    return _async_db
 
 
 def get_sync_client() -> MongoClient:
     """Get the sync MongoDB client for LangGraph checkpointer."""
     global _sync_client
     if _sync_client is None:
-        settings = get_settings()
-        _sync_client = MongoClient(settings.mongodb_url)
+        with _sync_init_lock:
+            if _sync_client is None:
+                settings = get_settings()
+                _sync_client = MongoClient(settings.mongodb_url, **_client_options(settings))
     return _sync_client
 
 
 def get_sync_database():
-    """Get the sync database instance."""
-    client = get_sync_client()
-    settings = get_settings()
-    return client[settings.database_name]
+    """Get the sync database instance (cached after first access)."""
+    global _sync_db
+    if _sync_db is None:
+        _sync_db = get_sync_client()[get_settings().database_name]
+    return _sync_db
 
 
 async def close_connections():
     """Close all database connections."""
-    global _async_client, _sync_client
+    global _async_client, _sync_client, _async_db, _sync_db
     
     if _async_client is not None:
         _async_client.close()
         _async_client = None
+    _async_db = None
     
     if _sync_client is not None:
         _sync_client.close()
         _sync_client = None
+    _sync_db = None
@@ -8,26 +8,40 @@ A chat API with LangGraph, LangChain-Groq, and MongoDB for:
 - Chat persistence
 """
 
-import traceback
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from config import get_settings
-from database import close_connections
+from database import close_connections, get_sync_database
+from utils.logging_setup import configure_logging
 from middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 from routes import chat_router, conversations_router, models_router, rag_router
 from routes.users import router as users_router
 
+# Route log records through a queue so handlers never block the event loop
+configure_logging()
+
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup
+    # Startup: make sure checkpoint cleanup deletes hit an index instead
+    # of scanning the whole collection. create_index is idempotent.
+    try:
+        db = get_sync_database()
+        db["checkpoints"].create_index("thread_id", background=True)
+        db["checkpoint_writes"].create_index("thread_id", background=True)
+    except Exception as e:
+        logger.warning("Index creation skipped: %s", e)
     yield
     # Shutdown
     await close_connections()
@@ -39,13 +53,14 @@ app = FastAPI(
     description="Chat API with memory and multi-model support",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS with explicit origins
 settings = get_settings()
 cors_origins = settings.cors_origins_list
-print(f"[CORS] Allowing origins: {cors_origins}", flush=True)
-print(f"[RateLimit] {settings.rate_limit_per_hour} requests/hour per user", flush=True)
+logger.info("CORS allowing origins: %s", cors_origins)
+logger.info("Rate limit: %s requests/hour per user", settings.rate_limit_per_hour)
 
 # Register rate limiter
 app.state.limiter = limiter
@@ -64,10 +79,8 @@ app.add_middleware(
 # Global exception handler to log all errors
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"[EXCEPTION] {request.method} {request.url.path}", flush=True)
-    print(f"  Error: {type(exc).__name__}: {exc}", flush=True)
-    traceback.print_exc()
-    return JSONResponse(
+    logger.exception("Unhandled error: %s %s", request.method, request.url.path)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": str(exc)},
     )
@@ -80,18 +93,24 @@ app.include_router(users_router)
 app.include_router(rag_router)
 
 
+# Liveness probes hit these constantly; serve constant bytes with no
+# per-request serialization
+_HEALTH_PAYLOAD = orjson.dumps({"status": "healthy", "service": "t3-chat-backend"})
+_ROOT_PAYLOAD = orjson.dumps({
+    "name": "T3.chat Clone API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health",
+})
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "t3-chat-backend"}
+    return Response(content=_HEALTH_PAYLOAD, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Root endpoint with API info."""
-    return {
-        "name": "T3.chat Clone API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health",
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
@@ -2,10 +2,11 @@
 
 from memory.checkpointer import get_checkpointer
 from memory.store import get_memory_store
-from memory.manager import MemoryManager
+from memory.manager import MemoryManager, get_memory_manager
 
 __all__ = [
     "get_checkpointer",
     "get_memory_store",
     "MemoryManager",
+    "get_memory_manager",
 ]
@@ -11,7 +11,7 @@ from database import get_sync_client
 from config import get_settings
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_checkpointer() -> MongoDBSaver:
     """
     Get the MongoDB checkpointer for short-term memory.
@@ -5,7 +5,9 @@ Handles deletion of short-term memory (checkpoints, checkpoint_writes)
 when conversations are deleted, while preserving long-term memories.
 """
 
-from database import get_sync_database
+import asyncio
+
+from database import get_database, get_sync_database
 from config import get_settings
 
 
@@ -57,7 +59,7 @@ def delete_checkpoint_writes(conversation_id: str) -> int:
     return result.deleted_count
 
 
-def cleanup_conversation_memory(conversation_id: str) -> dict:
+async def cleanup_conversation_memory(conversation_id: str) -> dict:
     """
     Clean up all short-term memory associated with a conversation.
     
@@ -65,6 +67,9 @@ def cleanup_conversation_memory(conversation_id: str) -> dict:
     - Checkpoints (graph state snapshots)
     - Checkpoint writes (graph operations)
     
+    Both deletes run concurrently on the async Motor client so the
+    event loop keeps serving other requests while Mongo works.
+    
     Long-term memories in the memory_store are NOT deleted and will
     persist for use in future conversations.
     
@@ -74,13 +79,16 @@ def cleanup_conversation_memory(conversation_id: str) -> dict:
     Returns:
         Dictionary with cleanup statistics
     """
-    checkpoints_deleted = delete_checkpoints(conversation_id)
-    checkpoint_writes_deleted = delete_checkpoint_writes(conversation_id)
+    db = await get_database()
+    checkpoints_result, writes_result = await asyncio.gather(
+        db["checkpoints"].delete_many({"thread_id": conversation_id}),
+        db["checkpoint_writes"].delete_many({"thread_id": conversation_id}),
+    )
     
     return {
         "conversation_id": conversation_id,
-        "checkpoints_deleted": checkpoints_deleted,
-        "checkpoint_writes_deleted": checkpoint_writes_deleted,
+        "checkpoints_deleted": checkpoints_result.deleted_count,
+        "checkpoint_writes_deleted": writes_result.deleted_count,
         "long_term_memories": "preserved",
     }
 
@@ -100,20 +108,21 @@ def cleanup_user_short_term_memory(user_id: str) -> dict:
     """
     db = get_sync_database()
     
-    # We need to find all conversation IDs for this user first
-    conversations = db["conversations"]
-    user_conversations = conversations.find({"user_id": user_id}, {"_id": 1})
+    # We need to find all conversation IDs for this user first. The large
+    # batch size keeps getMore round-trips to a minimum for id-only docs.
+    conversation_ids = [
+        conv["_id"]
+        for conv in db["conversations"].find({"user_id": user_id}, {"_id": 1}).batch_size(1000)
+    ]
     
     total_checkpoints = 0
     total_writes = 0
     
-    for conv in user_conversations:
-        conv_id = conv["_id"]
-        checkpoints_deleted = delete_checkpoints(conv_id)
-        writes_deleted = delete_checkpoint_writes(conv_id)
-        
-        total_checkpoints += checkpoints_deleted
-        total_writes += writes_deleted
+    if conversation_ids:
+        # Two bulk deletes instead of two round-trips per conversation
+        id_filter = {"thread_id": {"$in": conversation_ids}}
+        total_checkpoints = db["checkpoints"].delete_many(id_filter).deleted_count
+        total_writes = db["checkpoint_writes"].delete_many(id_filter).deleted_count
     
     return {
         "user_id": user_id,
@@ -4,14 +4,63 @@ Memory Manager - Orchestrates short-term and long-term memory operations.
 
 import json
 import hashlib
-from datetime import datetime
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
-import uuid
 
 from memory.store import get_memory_store
 from database import get_sync_client
 from config import get_settings
 
+# Formatted context memories barely change turn-to-turn within a
+# conversation, so cache them briefly keyed on (user_id, limit).
+# Writes invalidate the user's entries immediately.
+_CONTEXT_CACHE_TTL = 30.0
+_context_cache: dict[tuple[str, int], tuple[float, str]] = {}
+_context_cache_lock = threading.Lock()
+
+
+def _invalidate_context_cache(user_id: str) -> None:
+    """Drop cached context strings for a user after a memory write."""
+    with _context_cache_lock:
+        for cache_key in [k for k in _context_cache if k[0] == user_id]:
+            del _context_cache[cache_key]
+
+
+def _format_fact(value: dict) -> str | None:
+    content = value.get("content", "")
+    return f"- {content}" if content else None
+
+
+def _format_preference(value: dict) -> str | None:
+    return f"- User preference ({value.get('category', 'general')}): {value.get('value', '')}"
+
+
+# Dispatch on memory type instead of an if/elif chain per item
+_MEMORY_FORMATTERS = {
+    "fact": _format_fact,
+    "core_fact": _format_fact,
+    "preference": _format_preference,
+}
+
+
+@dataclass(slots=True)
+class MemoryItem:
+    """Lightweight key/value view over a memory_store document."""
+    key: str
+    value: dict
+
+
+@lru_cache(maxsize=4096)
+def _fact_hash(fact: str) -> str:
+    """Hash a normalized fact; memoized since batch saves and dedup checks
+    re-hash the same strings."""
+    normalized = fact.lower().strip()
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
 
 class MemoryManager:
     """
@@ -47,6 +96,7 @@ class MemoryManager:
                     key=key,
                     value=value,
                 )
+                _invalidate_context_cache(self.user_id)
                 return  # Success
             except Exception as e:
                 print(f"[MemoryManager] save_memory attempt {attempt + 1} failed: {e}", flush=True)
@@ -57,26 +107,24 @@ class MemoryManager:
         """Retrieve a specific memory item."""
         return self.store.get(namespace=self.namespace, key=key)
     
+    def _iter_memories(self, limit: int):
+        """Stream memories as MemoryItem objects.
+        
+        Uses direct MongoDB queries since store.search() has issues;
+        projects just the fields consumers read and sizes the first
+        cursor batch to the limit so one round-trip returns everything.
+        """
+        cursor = self._collection.find(
+            {"namespace": list(self.namespace)},
+            projection={"key": 1, "value": 1, "_id": 0},
+        ).batch_size(limit).limit(limit)
+        for doc in cursor:
+            yield MemoryItem(doc.get("key"), doc.get("value", {}))
+    
     def list_memories(self, limit: int = 100) -> list:
         """List all memories for the user using direct MongoDB query."""
         try:
-            # Use direct MongoDB query since store.search() has issues
-            namespace_list = list(self.namespace)
-            cursor = self._collection.find(
-                {"namespace": namespace_list}
-            ).limit(limit)
-            
-            results = []
-            for doc in cursor:
-                # Create a simple object with key and value attributes
-                class MemoryItem:
-                    def __init__(self, key, value):
-                        self.key = key
-                        self.value = value
-                
-                results.append(MemoryItem(doc.get("key"), doc.get("value", {})))
-            
-            return results
+            return list(self._iter_memories(limit))
         except Exception as e:
             print(f"Error listing memories: {e}")
             return []
@@ -84,55 +132,70 @@ class MemoryManager:
     def delete_memory(self, key: str) -> None:
         """Delete a specific memory."""
         self.store.delete(namespace=self.namespace, key=key)
+        _invalidate_context_cache(self.user_id)
     
     def _get_fact_hash(self, fact: str) -> str:
         """Generate a consistent hash for a fact to enable deduplication."""
-        # Normalize the fact for comparison
-        normalized = fact.lower().strip()
-        return hashlib.md5(normalized.encode()).hexdigest()[:12]
+        return _fact_hash(fact)
     
-    def _is_duplicate_fact(self, fact: str, existing_memories: list) -> bool:
+    @staticmethod
+    def _build_dedup_entries(existing_memories: list) -> list[tuple[str, set[str]]]:
+        """Normalize existing facts into (content, token-set) pairs once,
+        so comparing many candidates doesn't re-lower and re-split them."""
+        entries = []
+        for item in existing_memories:
+            value = item.value if hasattr(item, 'value') else item.get('value', {})
+            
+            # Only compare with facts, not preferences
+            if isinstance(value, dict) and value.get("type") in ("fact", "core_fact"):
+                existing_content = value.get("content", "").lower().strip()
+                entries.append((existing_content, set(existing_content.split())))
+        return entries
+    
+    @staticmethod
+    def _matches_entries(
+        fact_lower: str,
+        fact_tokens: set[str],
+        entries: list[tuple[str, set[str]]],
+    ) -> bool:
         """
-        Check if a similar fact already exists.
+        Check a normalized fact against prebuilt dedup entries.
         
         Uses multiple strategies:
         1. Exact match (case-insensitive)
         2. Substring containment (one is subset of another)
         3. Token-based similarity (high word overlap)
         """
-        # Normalize the input fact
-        fact_lower = fact.lower().strip()
-        fact_tokens = set(fact_lower.split())
-        
-        for item in existing_memories:
-            value = item.value if hasattr(item, 'value') else item.get('value', {})
+        for existing_content, existing_tokens in entries:
+            # Strategy 1: Exact match
+            if existing_content == fact_lower:
+                return True
             
-            # Only compare with facts, not preferences
-            if isinstance(value, dict) and value.get("type") in ("fact", "core_fact"):
-                existing_content = value.get("content", "").lower().strip()
-                existing_tokens = set(existing_content.split())
-                
-                # Strategy 1: Exact match
-                if existing_content == fact_lower:
-                    return True
+            # Strategy 2: Substring containment
+            # If one contains the other, they're likely duplicates or updates
+            if fact_lower in existing_content or existing_content in fact_lower:
+                return True
+            
+            # Strategy 3: High token overlap
+            # If they share 80%+ of words, they're likely duplicates
+            if len(fact_tokens) > 2 and len(existing_tokens) > 2:
+                overlap = len(fact_tokens & existing_tokens)
+                smaller_set_size = min(len(fact_tokens), len(existing_tokens))
+                similarity_ratio = overlap / smaller_set_size
                 
-                # Strategy 2: Substring containment
-                # If one contains the other, they're likely duplicates or updates
-                if fact_lower in existing_content or existing_content in fact_lower:
+                if similarity_ratio >= 0.8:
                     return True
-                
-                # Strategy 3: High token overlap
-                # If they share 80%+ of words, they're likely duplicates
-                if len(fact_tokens) > 2 and len(existing_tokens) > 2:
-                    overlap = len(fact_tokens & existing_tokens)
-                    smaller_set_size = min(len(fact_tokens), len(existing_tokens))
-                    similarity_ratio = overlap / smaller_set_size
-                    
-                    if similarity_ratio >= 0.8:
-                        return True
         
         return False
     
+    def _is_duplicate_fact(self, fact: str, existing_memories: list) -> bool:
+        """Check if a similar fact already exists."""
+        fact_lower = fact.lower().strip()
+        return self._matches_entries(
+            fact_lower, set(fact_lower.split()),
+            self._build_dedup_entries(existing_memories),
+        )
+    
     def save_fact(self, fact: str, source: str = "conversation") -> str | None:
         """
         Save a fact learned about the user with deduplication.
@@ -144,14 +207,22 @@ class MemoryManager:
         Returns:
             The key under which the fact was stored, or None if duplicate
         """
-        # Check for duplicates
+        # Fast path: an identical fact hashes to the same key, so one
+        # indexed point lookup settles the common exact-duplicate case
+        # before we pull any documents for the fuzzy comparison
+        fact_hash = self._get_fact_hash(fact)
+        key = f"fact_{fact_hash}"
+        
+        if self._collection.find_one(
+            {"namespace": list(self.namespace), "key": key}, {"_id": 1}
+        ) is not None:
+            return None
+        
+        # Check for near-duplicates (substring / token overlap)
         existing = self.list_memories(limit=50)
         if self._is_duplicate_fact(fact, existing):
             return None
         
-        # Use hash-based key for implicit deduplication
-        fact_hash = self._get_fact_hash(fact)
-        key = f"fact_{fact_hash}"
         
         self.save_memory(
             key=key,
@@ -159,7 +230,7 @@ class MemoryManager:
                 "type": "fact",
                 "content": fact,
                 "source": source,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             }
         )
         return key
@@ -175,12 +246,33 @@ class MemoryManager:
         Returns:
             List of keys for newly saved facts
         """
+        candidates = [f.strip() for f in facts if f and len(f.strip()) > 3]
+        if not candidates:
+            return []
+        
+        # One memory fetch for the whole batch; each accepted fact joins
+        # the entry list so intra-batch duplicates are caught too
+        entries = self._build_dedup_entries(self.list_memories(limit=50))
+        
         saved_keys = []
-        for fact in facts:
-            if fact and len(fact.strip()) > 3:  # Skip very short "facts"
-                key = self.save_fact(fact.strip(), source)
-                if key:
-                    saved_keys.append(key)
+        for fact in candidates:
+            fact_lower = fact.lower().strip()
+            fact_tokens = set(fact_lower.split())
+            if self._matches_entries(fact_lower, fact_tokens, entries):
+                continue
+            
+            key = f"fact_{self._get_fact_hash(fact)}"
+            self.save_memory(
+                key=key,
+                value={
+                    "type": "fact",
+                    "content": fact,
+                    "source": source,
+                    "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                }
+            )
+            entries.append((fact_lower, fact_tokens))
+            saved_keys.append(key)
         return saved_keys
     
     def save_preference(self, category: str, preference: str) -> str:
@@ -201,7 +293,7 @@ class MemoryManager:
                 "type": "preference",
                 "category": category,
                 "value": preference,
-                "updated_at": datetime.utcnow().isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             }
         )
         return key
@@ -227,57 +319,59 @@ class MemoryManager:
         Returns:
             Formatted string of relevant memories
         """
+        cache_key = (self.user_id, limit)
+        now = time.monotonic()
+        with _context_cache_lock:
+            cached = _context_cache.get(cache_key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        
         try:
-            memories = self.list_memories(limit=limit)
-            
-            if not memories:
-                return ""
-            
             memory_texts = []
-            for item in memories:
+            for item in self._iter_memories(limit):
                 value = item.value if hasattr(item, 'value') else item.get('value', {})
                 if isinstance(value, dict):
-                    mem_type = value.get("type", "")
-                    # Include both regular facts and core facts from settings
-                    if mem_type in ("fact", "core_fact"):
-                        content = value.get('content', '')
-                        if content:
-                            memory_texts.append(f"- {content}")
-                    elif mem_type == "preference":
-                        memory_texts.append(
-                            f"- User preference ({value.get('category', 'general')}): "
-                            f"{value.get('value', '')}"
-                        )
+                    formatter = _MEMORY_FORMATTERS.get(value.get("type", ""))
+                    if formatter is not None:
+                        line = formatter(value)
+                        if line:
+                            memory_texts.append(line)
             
             if not memory_texts:
                 return ""
             
-            return "Things I remember about you:\n" + "\n".join(memory_texts)
+            context = "Things I remember about you:\n" + "\n".join(memory_texts)
+            with _context_cache_lock:
+                _context_cache[cache_key] = (now + _CONTEXT_CACHE_TTL, context)
+            return context
         except Exception as e:
             print(f"Error getting context memories: {e}")
             return ""
     
     def clear_all_memories(self) -> int:
         """Clear all memories for this user. Returns count of deleted items."""
-        memories = self.list_memories(limit=1000)
-        count = 0
-        for item in memories:
-            key = item.key if hasattr(item, 'key') else item.get('key')
-            if key:
-                self.delete_memory(key)
-                count += 1
-        return count
+        result = self._collection.delete_many({"namespace": list(self.namespace)})
+        _invalidate_context_cache(self.user_id)
+        return result.deleted_count
 
 
-def extract_facts_from_response(llm_response: str) -> list[str]:
+@lru_cache(maxsize=1024)
+def get_memory_manager(user_id: str) -> MemoryManager:
     """
-    Parse the LLM's fact extraction response.
-    
-    Args:
-        llm_response: The raw LLM response (should be JSON array)
-        
-    Returns:
-        List of extracted facts
+    Get a cached MemoryManager for a user.
+
+    Constructing a manager opens store and database handles, so hot paths
+    should reuse one instance per user instead of rebuilding it per call.
+    """
+    return MemoryManager(user_id)
+
+
+@lru_cache(maxsize=2048)
+def _parse_facts(llm_response: str) -> tuple[str, ...]:
+    """Parse an extraction response into facts, cached on the raw string.
+
+    The extraction model returns identical text for common small turns, so
+    re-parsing is memoized. Returns a tuple because cached values are shared.
     """
     try:
         # Clean up the response
@@ -297,7 +391,20 @@ def extract_facts_from_response(llm_response: str) -> list[str]:
         facts = json.loads(response)
         
         if isinstance(facts, list):
-            return [str(f) for f in facts if f and isinstance(f, str)]
-        return []
+            return tuple(str(f) for f in facts if f and isinstance(f, str))
+        return ()
     except (json.JSONDecodeError, ValueError):
-        return []
+        return ()
+
+
+def extract_facts_from_response(llm_response: str) -> list[str]:
+    """
+    Parse the LLM's fact extraction response.
+    
+    Args:
+        llm_response: The raw LLM response (should be JSON array)
+        
+    Returns:
+        List of extracted facts
+    """
+    return list(_parse_facts(llm_response))
@@ -50,5 +50,10 @@ def get_memory_store() -> MongoDBStore:
         _memory_store = MongoDBStore(
             collection=db["memory_store"],
         )
+        # Namespace lookups back every list/dedup call; keep them indexed
+        try:
+            db["memory_store"].create_index("namespace")
+        except Exception as e:
+            print(f"[MemoryStore] Index creation skipped: {e}", flush=True)
     
     return _memory_store
@@ -40,6 +40,46 @@ class RAGRetriever:
         self.chunks_collection = self.db["rag_chunks"]
         self.embeddings = get_embeddings()
         self.top_k = settings.rag_top_k
+        self.use_vector_search = settings.rag_use_vector_search
+    
+    def _vector_search(
+        self,
+        query_embedding: list[float],
+        conversation_id: str,
+        top_k: int,
+    ) -> list[dict]:
+        """Run the ANN search server-side via Atlas $vectorSearch.
+        
+        Only top_k documents cross the wire instead of every chunk in
+        the conversation. Requires the "rag_vec" Atlas search index.
+        """
+        pipeline = [
+            {"$vectorSearch": {
+                "index": "rag_vec",
+                "path": "embedding",
+                "queryVector": query_embedding,
+                "numCandidates": top_k * 10,
+                "limit": top_k,
+                "filter": {"conversation_id": conversation_id},
+            }},
+            {"$project": {
+                "text": 1,
+                "document_id": 1,
+                "chunk_index": 1,
+                "score": {"$meta": "vectorSearchScore"},
+            }},
+        ]
+        return [
+            {
+                "text": doc["text"],
+                "document_id": doc["document_id"],
+                "chunk_index": doc["chunk_index"],
+                # Atlas reports cosine as (1 + cos) / 2; map back so the
+                # relevance threshold means the same on both paths
+                "score": float(doc["score"]) * 2.0 - 1.0,
+            }
+            for doc in self.chunks_collection.aggregate(pipeline)
+        ]
     
     def retrieve(
         self,
@@ -61,9 +101,18 @@ class RAGRetriever:
         if top_k is None:
             top_k = self.top_k
         
-        # Get all chunks for this conversation
+        if self.use_vector_search:
+            try:
+                query_embedding = self.embeddings.embed_query(query)
+                return self._vector_search(query_embedding, conversation_id, top_k)
+            except Exception:
+                # Index missing or not on Atlas; fall back to local scoring
+                pass
+        
+        # Get all chunks for this conversation (only the fields we score on)
         chunks = list(self.chunks_collection.find(
-            {"conversation_id": conversation_id}
+            {"conversation_id": conversation_id, "embedding": {"$exists": True}},
+            projection={"embedding": 1, "text": 1, "document_id": 1, "chunk_index": 1},
         ))
         
         if not chunks:
@@ -72,23 +121,36 @@ class RAGRetriever:
         # Embed the query
         query_embedding = self.embeddings.embed_query(query)
         
-        # Score all chunks
-        scored_chunks = []
-        for chunk in chunks:
-            if "embedding" not in chunk:
-                continue
-            
-            score = cosine_similarity(query_embedding, chunk["embedding"])
-            scored_chunks.append({
-                "text": chunk["text"],
-                "document_id": chunk["document_id"],
-                "chunk_index": chunk["chunk_index"],
-                "score": float(score),
-            })
-        
-        # Sort by score and return top_k
-        scored_chunks.sort(key=lambda x: x["score"], reverse=True)
-        return scored_chunks[:top_k]
+        # Score every chunk with a single matrix-vector product instead of
+        # a Python loop of per-chunk cosine calls
+        matrix = np.asarray([c["embedding"] for c in chunks], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        matrix /= norms[:, np.newaxis]
+        
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm > 0:
+            q /= q_norm
+        
+        scores = matrix @ q
+        
+        # Partial-select the top_k before the (small) sort
+        if top_k < len(scores):
+            top_indices = np.argpartition(scores, -top_k)[-top_k:]
+        else:
+            top_indices = np.arange(len(scores))
+        top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
+        
+        return [
+            {
+                "text": chunks[i]["text"],
+                "document_id": chunks[i]["document_id"],
+                "chunk_index": chunks[i]["chunk_index"],
+                "score": float(scores[i]),
+            }
+            for i in top_indices
+        ]
     
     def get_context(
         self,
@@ -107,23 +169,44 @@ class RAGRetriever:
         Returns:
             Formatted context string or empty string if no relevant chunks
         """
-        chunks = self.retrieve(query, conversation_id, top_k)
+        context, _ = self.get_context_and_chunks(query, conversation_id, top_k)
+        return context
+    
+    def get_context_and_chunks(
+        self,
+        query: str,
+        conversation_id: str,
+        top_k: int | None = None,
+    ) -> tuple[str, list[dict]]:
+        """
+        Get formatted context and the relevant chunks in one retrieval.
         
-        if not chunks:
-            return ""
+        Callers that need both (e.g. tool-context assembly reporting chunk
+        counts) previously ran the vector search twice.
+        
+        Args:
+            query: The user's question
+            conversation_id: The conversation to search within
+            top_k: Number of chunks to include
+            
+        Returns:
+            Tuple of (formatted context string, relevant chunks); both are
+            empty when nothing scores above the relevance threshold
+        """
+        chunks = self.retrieve(query, conversation_id, top_k)
         
         # Filter out low-scoring chunks
         relevant_chunks = [c for c in chunks if c["score"] > 0.3]
         
         if not relevant_chunks:
-            return ""
+            return "", []
         
         # Format as context
         context_parts = ["Relevant information from uploaded documents:"]
         for i, chunk in enumerate(relevant_chunks, 1):
             context_parts.append(f"\n[Document excerpt {i}]:\n{chunk['text']}")
         
-        return "\n".join(context_parts)
+        return "\n".join(context_parts), relevant_chunks
 
 
 # Singleton instance
@@ -5,12 +5,15 @@ Stores PDFs in S3 and vector embeddings in MongoDB scoped to conversations.
 
 import io
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import BinaryIO, Optional
 
 import pdfplumber
 import numpy as np
 from langchain_ollama import OllamaEmbeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from config import get_settings
 from database import get_sync_client
@@ -26,57 +29,50 @@ def get_embeddings() -> OllamaEmbeddings:
 
 
 def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF using pdfplumber."""
-    text_parts = []
+    """Extract text from PDF using pdfplumber.
+
+    Pages are written straight into a string buffer and each page's
+    layout cache is released as soon as it is read, so peak memory stays
+    near one page plus the output instead of the whole document twice.
+    """
+    buffer = io.StringIO()
     with pdfplumber.open(io.BytesIO(file_content)) as pdf:
         for page in pdf.pages:
             page_text = page.extract_text()
             if page_text:
-                text_parts.append(page_text)
-    return "\n\n".join(text_parts)
+                if buffer.tell():
+                    buffer.write("\n\n")
+                buffer.write(page_text)
+            page.flush_cache()
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Cache splitter instances per (chunk_size, chunk_overlap) config."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " ", ""],
+        length_function=len,
+    )
 
 
 def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[dict]:
     """
     Split text into overlapping chunks.
     
+    Delegates to LangChain's RecursiveCharacterTextSplitter, which walks
+    a separator hierarchy (paragraph, line, sentence, word) instead of
+    the previous per-chunk rfind scans.
+    
     Returns list of dicts with 'text' and 'index' keys.
     """
     if not text:
         return []
     
-    chunks = []
-    start = 0
-    index = 0
-    
-    while start < len(text):
-        end = start + chunk_size
-        chunk_text_content = text[start:end]
-        
-        # Try to break at sentence boundary if possible
-        if end < len(text):
-            # Look for sentence end within last 100 chars
-            last_period = chunk_text_content.rfind('. ')
-            last_newline = chunk_text_content.rfind('\n')
-            break_point = max(last_period, last_newline)
-            
-            if break_point > chunk_size * 0.7:  # Only break if we have enough content
-                chunk_text_content = chunk_text_content[:break_point + 1]
-                end = start + break_point + 1
-        
-        chunks.append({
-            "text": chunk_text_content.strip(),
-            "index": index,
-        })
-        
-        index += 1
-        start = end - chunk_overlap
-        
-        # Prevent infinite loop
-        if start >= len(text) - chunk_overlap:
-            break
-    
-    return chunks
+    pieces = _get_splitter(chunk_size, chunk_overlap).split_text(text)
+    return [{"text": piece, "index": i} for i, piece in enumerate(pieces)]
 
 
 class RAGStore:
@@ -116,6 +112,21 @@ class RAGStore:
             self._s3_client = get_s3_client()
         return self._s3_client
     
+    def _embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed chunk texts with bounded concurrency.
+        
+        OllamaEmbeddings.embed_documents posts one request per chunk
+        sequentially, so ingestion time is chunks x round-trip. Fan the
+        requests out across a small thread pool (at most 8 in flight);
+        pool.map preserves chunk order, and threads work whether the
+        caller is sync or a coroutine on the event loop.
+        """
+        if len(texts) <= 1:
+            return self.embeddings.embed_documents(texts)
+        
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="embed") as pool:
+            return list(pool.map(self.embeddings.embed_query, texts))
+    
     def _ensure_indexes(self):
         """Create necessary indexes."""
         self.documents_collection.create_index([
@@ -178,7 +189,7 @@ class RAGStore:
         
         # Generate embeddings for all chunks
         chunk_texts = [c["text"] for c in chunks]
-        embeddings = self.embeddings.embed_documents(chunk_texts)
+        embeddings = self._embed_texts(chunk_texts)
         
         # Store document metadata in MongoDB
         doc_metadata = {
@@ -194,9 +205,14 @@ class RAGStore:
         }
         self.documents_collection.insert_one(doc_metadata)
         
-        # Store chunks with embeddings
+        # Store chunks with embeddings, L2-normalized at write time so
+        # cosine similarity downstream is a pure dot product
         chunk_docs = []
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            if norm > 0:
+                vector = vector / norm
             chunk_docs.append({
                 "_id": f"{document_id}_chunk_{i}",
                 "document_id": document_id,
@@ -204,7 +220,8 @@ class RAGStore:
                 "user_id": user_id,
                 "chunk_index": chunk["index"],
                 "text": chunk["text"],
-                "embedding": embedding,
+                "embedding": vector.tolist(),
+                "norm": 1.0,
                 "created_at": datetime.utcnow(),
             })
         
@@ -144,7 +144,7 @@ async def delete_conversation(
         )
     
     # Clean up short-term memory (checkpoints and checkpoint_writes)
-    cleanup_stats = cleanup_conversation_memory(conversation_id)
+    cleanup_stats = await cleanup_conversation_memory(conversation_id)
     
     # Delete the conversation document
     await conversations.delete_one({
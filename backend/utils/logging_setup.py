@@ -0,0 +1,35 @@
+"""
+Non-blocking logging configuration for the backend.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Route all log records through a queue so emission never blocks.
+
+    Flushed stdio writes are blocking syscalls; issued from async request
+    handlers they serialize throughput under load. A QueueHandler turns
+    each log call into a cheap enqueue, and a background QueueListener
+    thread does the actual writes.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return  # Already configured
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
@@ -9,7 +9,7 @@ from functools import lru_cache
 
 import tiktoken
 
-from config import AVAILABLE_MODELS, get_settings
+from config import MODELS_BY_ID, get_settings
 
 
 @lru_cache
@@ -42,9 +42,9 @@ def count_messages_tokens(messages: list) -> int:
 
 def get_model_context_length(model_name: str) -> int:
     """Look up the context window size for a model."""
-    for model in AVAILABLE_MODELS:
-        if model["id"] == model_name:
-            return model["context_length"]
+    model = MODELS_BY_ID.get(model_name)
+    if model is not None:
+        return model["context_length"]
     # Default fallback
     return 128000
 